@@ -6,6 +6,8 @@ to the Flask instance app.
 # Import necessary modules
 from flask import Flask, jsonify  # Import jsonify from flask
 from api.v1.views import app_views  # Import app_views BP from api.v1.views
+from api.v1.json_provider import json_provider
+from api.v1.compression import compress
 from models import storage  # Imports the storage instance from models package
 import os
 from flask_cors import CORS
@@ -14,9 +16,15 @@ from flask_cors import CORS
 # Set up the Flask app
 app = Flask(__name__)
 
+# Serialize responses with the fastest JSON library available
+app.json = json_provider(app)
+
 # Register the app_views blueprint to the Flask instance app
 app.register_blueprint(app_views, url_prefix="/api/v1")
 
+# Compress the responses as the clients accept
+app.after_request(compress)
+
 
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "0.0.0.0"}})
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Compression of the responses, negotiated with the Accept-Encoding header
+of the request: brotli if installed and accepted, else gzip, at level
+HBNB_API_COMPRESS_LEVEL (default 6). JSON and text bodies are compressed
+from HBNB_API_COMPRESS_MIN_SIZE bytes (default 500), streamed ones
+always, chunk by chunk.
+"""
+from flask import request
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+level = int(os.getenv("HBNB_API_COMPRESS_LEVEL", 6))
+min_size = int(os.getenv("HBNB_API_COMPRESS_MIN_SIZE", 500))
+# content codings supported, preferred first
+encodings = ("br", "gzip") if brotli else ("gzip",)
+
+
+def compress_chunks(chunks, encoding):
+    """yields the chunks of bytes compressed to encoding"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        compress, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def compress(response):
+    """compresses response as the request accepts, returns it"""
+    if response.status_code != 200 or \
+            "Content-Encoding" in response.headers or \
+            response.mimetype != "application/json" and \
+            not response.mimetype.startswith("text/"):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None or response.direct_passthrough:
+        return response
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        response.set_data(b"".join(compress_chunks([data], encoding)))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Conditional GET requests: responses carry a strong ETag hashed from the
+id and updated_at of the objects they list. A client sending back the
+ETag in If-None-Match gets a 304 Not Modified without the objects being
+serialized. Responses of a single object also carry its updated_at as
+Last-Modified and honor If-Modified-Since, not lists: deleting one of
+their objects leaves the latest updated_at as is.
+"""
+from datetime import timezone
+from flask import current_app, request
+from hashlib import sha1
+
+
+def validators(objs):
+    """returns the ETag and the last modification time of objs, the ETag
+    is hashed with the path and query string of the request too"""
+    digest = sha1(request.full_path.encode())
+    last_modified = None
+    for obj in objs:
+        digest.update("{}.{}|{}\n".format(obj.__class__.__name__, obj.id,
+                                          obj.updated_at.isoformat())
+                      .encode())
+        if last_modified is None or obj.updated_at > last_modified:
+            last_modified = obj.updated_at
+    return digest.hexdigest(), last_modified
+
+
+def is_current(etag, last_modified):
+    """tells if the copy of the client is the one of etag/last_modified"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        last_modified = last_modified.replace(microsecond=0,
+                                              tzinfo=timezone.utc)
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(objs, render, dated=False):
+    """returns the response render() of the list objs, or a 304 one if
+    the client has it already, dated with Last-Modified if dated"""
+    etag, last_modified = validators(objs)
+    if not dated:
+        last_modified = None
+    if is_current(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = render()
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+JSON providers of the API app: orjson, else ujson, else the standard
+library one of Flask, or the one named by HBNB_API_JSON
+("orjson", "ujson" or "json"). All of them write non-ASCII text as
+UTF-8, as orjson does, so that the bodies are the same whichever is used.
+"""
+from flask.json.provider import DefaultJSONProvider
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider serializing with orjson, straight to bytes"""
+
+    def options(self):
+        """returns the orjson options matching the app settings, datetimes
+        are left to default() to keep the format of Flask"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """serializes obj to a JSON string"""
+        return orjson.dumps(obj, default=self.default,
+                            option=self.options()).decode()
+
+    def loads(self, s, **kwargs):
+        """deserializes the JSON string or bytes s"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """returns a JSON response of the arguments, as jsonify() does"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default,
+                         option=self.options() | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype)
+
+
+class UjsonProvider(DefaultJSONProvider):
+    """JSON provider serializing with ujson"""
+
+    def dumps(self, obj, **kwargs):
+        """serializes obj to a JSON string"""
+        return ujson.dumps(obj, sort_keys=self.sort_keys,
+                           ensure_ascii=self.ensure_ascii,
+                           default=self.default)
+
+    def loads(self, s, **kwargs):
+        """deserializes the JSON string or bytes s"""
+        return ujson.loads(s)
+
+
+# providers by name, fastest first, None when the library is missing
+providers = {"orjson": OrjsonProvider if orjson else None,
+             "ujson": UjsonProvider if ujson else None,
+             "json": DefaultJSONProvider}
+
+
+def json_provider(app):
+    """returns the JSON provider to use for app"""
+    name = os.getenv("HBNB_API_JSON")
+    if name:
+        if providers.get(name) is None:
+            raise ValueError("JSON library not available: " + name)
+        provider = providers[name](app)
+    else:
+        provider = next(provider for provider in providers.values()
+                        if provider is not None)(app)
+    provider.ensure_ascii = False
+    return provider
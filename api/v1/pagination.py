@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Keyset pagination of the list endpoints: when ?limit= is given, objects
+are returned ordered by (created_at, id) as {"results": [...], "next": ...}
+where next is the cursor to pass as ?after= to get the following page.
+Lists are answered as conditional requests, or streamed, see stream().
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from api.v1.conditional import conditional
+from api.v1.streaming import chunk_size, stream, wants_stream
+from flask import abort, jsonify, request
+from models import storage
+from models.base_model import time, to_dicts
+
+order = ("created_at", "id")
+
+
+def encode_cursor(obj):
+    """returns the cursor of the page starting after obj"""
+    value = "{}|{}".format(obj.created_at.strftime(time), obj.id)
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """returns the (created_at, id) encoded in cursor"""
+    try:
+        created_at, id = urlsafe_b64decode(cursor.encode()).decode() \
+            .split("|", 1)
+        return (datetime.strptime(created_at, time), id)
+    except ValueError:
+        abort(400, "Invalid cursor")
+
+
+def page_args():
+    """returns the (limit, after) of the request, (None, None) if unpaged"""
+    limit = request.args.get("limit")
+    if limit is None:
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(400, "Invalid limit")
+    if limit < 1:
+        abort(400, "Invalid limit")
+    after = request.args.get("after")
+    return limit, decode_cursor(after) if after else None
+
+
+def page(objs, limit):
+    """returns the response for the first limit of objs (limit + 1 max)"""
+    objs = list(objs)
+    cursor = encode_cursor(objs[limit - 1]) if len(objs) > limit else None
+    return jsonify({"results": to_dicts(objs[:limit]), "next": cursor})
+
+
+def paginate(cls, **filters):
+    """returns the response listing the objects of cls matching filters"""
+    limit, after = page_args()
+    if limit is None and wants_stream():
+        return stream(storage.iterate(cls, chunk_size=chunk_size,
+                                      **filters))
+    if limit is None:
+        objs = list(storage.all(cls, **filters).values())
+        return conditional(objs, lambda: jsonify(to_dicts(objs)))
+    objs = list(storage.all(cls, order_by=order, limit=limit + 1,
+                            after=after, **filters).values())
+    return conditional(objs, lambda: page(objs, limit))
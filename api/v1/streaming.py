@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+Streaming of the list endpoints: with ?stream=1 and no ?limit=, objects
+are read from storage HBNB_API_STREAM_CHUNK (default 500) at a time and
+sent as a JSON array written chunk by chunk, so neither all the
+dictionaries nor the whole body are held in memory.
+"""
+from flask import current_app, request, stream_with_context
+from itertools import islice
+from models.base_model import to_dicts
+import os
+
+chunk_size = int(os.getenv("HBNB_API_STREAM_CHUNK", 500))
+
+
+def wants_stream():
+    """tells if the request asks for a streamed response"""
+    return request.args.get("stream", "").lower() in ("1", "true")
+
+
+def json_array(objs):
+    """yields the JSON array of the dictionaries of the iterable objs"""
+    dumps = current_app.json.dumps
+    objs = iter(objs)
+    separator = ""
+    yield b"["
+    while True:
+        chunk = list(islice(objs, chunk_size))
+        if not chunk:
+            break
+        yield (separator + ",".join(dumps(obj_dict)
+                                    for obj_dict in to_dicts(chunk))).encode()
+        separator = ","
+    yield b"]\n"
+
+
+def stream(objs):
+    """returns the streamed response listing the iterable objs"""
+    return current_app.response_class(stream_with_context(json_array(objs)),
+                                      mimetype="application/json")
@@ -7,14 +7,16 @@ from flask import jsonify, abort, request
 from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from api.v1.pagination import paginate
+from web_flask.response_cache import cached
 
 
 @app_views.route("/amenities", methods=['GET'], strict_slashes=False)
+@cached("Amenity")
 def get_all_amenities():
     """Retrieves the list of all Amenity objects"""
-    amenities = storage.all(Amenity).values()
-    amenity_list = [amenity.to_dict() for amenity in amenities]
-    return jsonify(amenity_list)
+    return paginate(Amenity)
 
 
 @app_views.route("/amenities/<amenity_id>", methods=['GET'],
@@ -24,7 +26,8 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
 
     if amenity:
-        return jsonify(amenity.to_dict())
+        return conditional([amenity], lambda: jsonify(amenity.to_dict()),
+                           dated=True)
     else:
         abort(404)
 
@@ -7,17 +7,20 @@ from models.state import State
 from models.city import City
 from models import storage
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from api.v1.pagination import paginate
+from web_flask.response_cache import cached
 
 
 @app_views.route("/states/<state_id>/cities", strict_slashes=False)
+@cached("State", "City")
 def get_cities(state_id):
     """Retrieves the list of all City objects of a State"""
     state = storage.get(State, state_id)
     if not state:
         abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return paginate(City, state_id=state_id)
 
 
 @app_views.route("/cities/<city_id>", strict_slashes=False)
@@ -26,7 +29,8 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return conditional([city], lambda: jsonify(city.to_dict()),
+                       dated=True)
 
 
 @app_views.route("/cities/<city_id>", methods=["DELETE"], strict_slashes=False)
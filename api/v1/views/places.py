@@ -8,20 +8,23 @@ from models.place import Place
 from models.city import City
 from models.user import User
 from models import storage
+from models.base_model import to_dicts
 from api.v1.views import app_views
-from models.state import State
-from models.amenity import Amenity
+from api.v1.conditional import conditional
+from api.v1.pagination import order, page, page_args, paginate
+from api.v1.streaming import chunk_size, stream, wants_stream
+from web_flask.response_cache import cached
 
 
 @app_views.route("/cities/<city_id>/places", methods=["GET"],
                  strict_slashes=False)
+@cached("City", "Place")
 def get_places_by_city(city_id):
     """Retrieves the list of all Place objects of a City"""
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return paginate(Place, city_id=city_id)
 
 
 @app_views.route("/places/<place_id>", methods=["GET"], strict_slashes=False)
@@ -30,7 +33,8 @@ def get_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return jsonify(place.to_dict())
+    return conditional([place], lambda: jsonify(place.to_dict()),
+                       dated=True)
 
 
 @app_views.route("/places/<place_id>", methods=["DELETE"],
@@ -88,36 +92,23 @@ def update_place(place_id):
 @app_views.route("/places_search", methods=["POST"], strict_slashes=False)
 def search_places():
     """Searches for places based on criteria"""
-    data = request.get_json()
-    if not data:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
         abort(400, "Not a JSON")
 
-    states = data.get("states", [])
-    cities = data.get("cities", [])
-    amenities = data.get("amenities", [])
-
-    places = []
-
-    if not states and not cities and not amenities:
-        places = storage.all(Place).values()
-    else:
-        for state_id in states:
-            state = storage.get(State, state_id)
-            if state:
-                for city in state.cities:
-                    places.extend(city.places)
-
-        for city_id in cities:
-            city = storage.get(City, city_id)
-            if city:
-                places.extend(city.places)
-
-        if amenities:
-            for amenity_id in amenities:
-                amenity = storage.get(Amenity, amenity_id)
-                if amenity:
-                    for place in amenity.places:
-                        if place not in places:
-                            places.append(place)
-
-    return jsonify([place.to_dict() for place in places])
+    limit, after = page_args()
+    if limit is None and wants_stream():
+        return stream(storage.search_places(states=data.get("states"),
+                                            cities=data.get("cities"),
+                                            amenities=data.get("amenities"),
+                                            order_by=order,
+                                            chunk_size=chunk_size))
+    places = storage.search_places(states=data.get("states"),
+                                   cities=data.get("cities"),
+                                   amenities=data.get("amenities"),
+                                   order_by=order,
+                                   limit=limit + 1 if limit else None,
+                                   after=after).values()
+    if limit is None:
+        return jsonify(to_dicts(places))
+    return page(places, limit)
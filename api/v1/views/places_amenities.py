@@ -7,17 +7,22 @@ from flask import jsonify, abort
 from models.place import Place
 from models.amenity import Amenity
 from models import storage
+from models.base_model import to_dicts
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from web_flask.response_cache import cached
 
 
 @app_views.route("/places/<place_id>/amenities", methods=["GET"],
                  strict_slashes=False)
+@cached("Place", "Amenity")
 def get_place_amenities(place_id):
     """Retrieves the list of all Amenity objects of a Place"""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load="amenities")
     if place is None:
         abort(404)
-    return jsonify([amenity.to_dict() for amenity in place.amenities])
+    amenities = list(place.amenities)
+    return conditional(amenities, lambda: jsonify(to_dicts(amenities)))
 
 
 @app_views.route("/places/<place_id>/amenities/<amenity_id>",
@@ -32,7 +37,7 @@ def delete_place_amenity(place_id, amenity_id):
         abort(404)
     if amenity not in place.amenities:
         abort(404)
-    place.amenities.remove(amenity)
+    storage.unlink_amenity(place, amenity)
     storage.save()
     return jsonify({}), 200
 
@@ -49,6 +54,6 @@ def link_place_amenity(place_id, amenity_id):
         abort(404)
     if amenity in place.amenities:
         return jsonify(amenity.to_dict()), 200
-    place.amenities.append(amenity)
+    storage.link_amenity(place, amenity)
     storage.save()
     return jsonify(amenity.to_dict()), 201
@@ -9,17 +9,20 @@ from models.place import Place
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from api.v1.pagination import paginate
+from web_flask.response_cache import cached
 
 
 @app_views.route("/places/<place_id>/reviews", methods=["GET"],
                  strict_slashes=False)
+@cached("Place", "Review")
 def get_reviews_by_place(place_id):
     """Retrieves the list of all Review objects of a Place"""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return paginate(Review, place_id=place_id)
 
 
 @app_views.route("/reviews/<review_id>", methods=["GET"], strict_slashes=False)
@@ -28,7 +31,8 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return jsonify(review.to_dict())
+    return conditional([review], lambda: jsonify(review.to_dict()),
+                       dated=True)
 
 
 @app_views.route("/reviews/<review_id>", methods=["DELETE"],
@@ -7,14 +7,16 @@ from flask import jsonify, abort, request
 from models.state import State
 from models import storage
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from api.v1.pagination import paginate
+from web_flask.response_cache import cached
 
 
 @app_views.route("/states", methods=["GET"], strict_slashes=False)
+@cached("State")
 def get_all_states():
     """Retrieve all states"""
-    states = storage.all(State).values()
-    state_list = [state.to_dict() for state in states]
-    return jsonify(state_list)
+    return paginate(State)
 
 
 @app_views.route("/states/<state_id>", methods=["GET"], strict_slashes=False)
@@ -23,7 +25,8 @@ def get_state(state_id):
     state = storage.get(State, state_id)
 
     if state:
-        return jsonify(state.to_dict())
+        return conditional([state], lambda: jsonify(state.to_dict()),
+                           dated=True)
     else:
         abort(404)
 
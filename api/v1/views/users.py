@@ -6,14 +6,16 @@ from flask import jsonify, abort, request
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.conditional import conditional
+from api.v1.pagination import paginate
+from web_flask.response_cache import cached
 
 
 @app_views.route("/users", methods=["GET"], strict_slashes=False)
+@cached("User")
 def get_all_users():
     """Retrieves the list of all User objects"""
-    users = storage.all(User).values()
-    user_list = [user.to_dict() for user in users]
-    return jsonify(user_list)
+    return paginate(User)
 
 
 @app_views.route("/users/<user_id>", methods=["GET"], strict_slashes=False)
@@ -21,7 +23,8 @@ def get_user(user_id):
     """Retrieves a User object"""
     user = storage.get(User, user_id)
     if user:
-        return jsonify(user.to_dict())
+        return conditional([user], lambda: jsonify(user.to_dict()),
+                           dated=True)
     else:
         abort(404)
 
@@ -21,6 +21,10 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # bool - whether the instance changed since storage last persisted it,
+    # kept out of __dict__ so it is neither serialized nor printed
+    __slots__ = ("_dirty", "__dict__", "__weakref__")
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -46,6 +50,14 @@ class BaseModel:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
+        self._dirty = True
+
+    def __setattr__(self, name, value):
+        """sets an attribute, flagging the instance as changed"""
+        super().__setattr__(name, value)
+        if name != "_dirty" and getattr(self, "_dirty", None) is not None:
+            super().__setattr__("_dirty", True)
+            models.storage.mark_dirty(self, name)
 
     def __str__(self):
         """String representation of the BaseModel class"""
@@ -60,18 +72,40 @@ class BaseModel:
 
     def to_dict(self, exclude_password=True):
         """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
-        if exclude_password and "password" in new_dict:
-            del new_dict["password"]
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
-        return new_dict
+        return to_dicts((self,), exclude_password)[0]
 
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
+
+
+def to_dicts(objs, exclude_password=True):
+    """returns the to_dict() of every object of objs
+
+    The attributes left out are the password unless exclude_password is
+    False, and the SQLAlchemy state and relationships. They are worked out
+    once per class and the datetimes are formatted by isoformat(), same
+    output as strftime(time).
+    """
+    dicts = []
+    excluded = {}
+    for obj in objs:
+        cls = obj.__class__
+        drop = excluded.get(cls)
+        if drop is None:
+            drop = {"_sa_instance_state"}
+            if exclude_password:
+                drop.add("password")
+            state = obj.__dict__.get("_sa_instance_state")
+            if state is not None:
+                drop.update(state.mapper.relationships.keys())
+            excluded[cls] = drop
+        new_dict = {key: value for key, value in obj.__dict__.items()
+                    if key not in drop}
+        for key in ("created_at", "updated_at"):
+            if key in new_dict:
+                new_dict[key] = new_dict[key].isoformat(
+                    timespec="microseconds")
+        new_dict["__class__"] = cls.__name__
+        dicts.append(new_dict)
+    return dicts
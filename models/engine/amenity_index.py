@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the AmenityIndex class
+"""
+
+
+class AmenityIndex:
+    """inverted index of amenity ids to the places having them
+
+    Each place gets an ordinal and each amenity a bitmap, held in an int,
+    with the bits of the ordinals of its places set, so that places having
+    all (or any) of several amenities are found with bitwise AND (or OR).
+    """
+
+    def __init__(self, pairs=()):
+        """builds the index from an iterable of (place id, amenity id)"""
+        # dictionary - place id: ordinal
+        self.__ordinals = {}
+        # list - place id of each ordinal, None once the place is removed
+        self.__places = []
+        # list - ordinals of removed places, reused by new places
+        self.__free = []
+        # dictionary - amenity id: bitmap of the ordinals of its places
+        self.__bitmaps = {}
+        # dictionary - place id: set of its amenity ids
+        self.__amenities = {}
+        for place_id, amenity_id in pairs:
+            self.add(place_id, amenity_id)
+
+    def __ordinal(self, place_id):
+        """returns the ordinal of place_id, assigning one if needed"""
+        ordinal = self.__ordinals.get(place_id)
+        if ordinal is None:
+            if self.__free:
+                ordinal = self.__free.pop()
+                self.__places[ordinal] = place_id
+            else:
+                ordinal = len(self.__places)
+                self.__places.append(place_id)
+            self.__ordinals[place_id] = ordinal
+            self.__amenities[place_id] = set()
+        return ordinal
+
+    def add(self, place_id, amenity_id):
+        """records that place_id has amenity_id"""
+        bit = 1 << self.__ordinal(place_id)
+        self.__bitmaps[amenity_id] = self.__bitmaps.get(amenity_id, 0) | bit
+        self.__amenities[place_id].add(amenity_id)
+
+    def remove(self, place_id, amenity_id=None):
+        """forgets that place_id has amenity_id, or the place if None"""
+        ordinal = self.__ordinals.get(place_id)
+        if ordinal is None:
+            return
+        amenities = self.__amenities[place_id]
+        removed = set(amenities) if amenity_id is None else \
+            amenities & {amenity_id}
+        for id in removed:
+            self.__bitmaps[id] &= ~(1 << ordinal)
+            if not self.__bitmaps[id]:
+                del self.__bitmaps[id]
+            amenities.discard(id)
+        if not amenities:
+            del self.__ordinals[place_id]
+            del self.__amenities[place_id]
+            self.__places[ordinal] = None
+            self.__free.append(ordinal)
+
+    def set(self, place_id, amenity_ids):
+        """replaces the amenities of place_id by amenity_ids"""
+        self.remove(place_id)
+        for amenity_id in amenity_ids:
+            self.add(place_id, amenity_id)
+
+    def remove_amenity(self, amenity_id):
+        """forgets amenity_id for every place"""
+        for place_id in self.__place_ids(self.__bitmaps.get(amenity_id, 0)):
+            self.remove(place_id, amenity_id)
+
+    def all_of(self, amenity_ids):
+        """returns the ids of the places having all of amenity_ids"""
+        bitmaps = [self.__bitmaps.get(id, 0) for id in set(amenity_ids)]
+        if not bitmaps:
+            return []
+        bitmap = bitmaps[0]
+        for other in bitmaps[1:]:
+            bitmap &= other
+        return self.__place_ids(bitmap)
+
+    def any_of(self, amenity_ids):
+        """returns the ids of the places having any of amenity_ids"""
+        bitmap = 0
+        for id in set(amenity_ids):
+            bitmap |= self.__bitmaps.get(id, 0)
+        return self.__place_ids(bitmap)
+
+    def __place_ids(self, bitmap):
+        """returns the place ids of the ordinals set in bitmap"""
+        bits = bin(bitmap)[:1:-1]
+        place_ids = []
+        ordinal = bits.find("1")
+        while ordinal != -1:
+            place_ids.append(self.__places[ordinal])
+            ordinal = bits.find("1", ordinal + 1)
+        return place_ids
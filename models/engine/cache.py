@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Contains the LRUCache class
+"""
+from collections import OrderedDict
+import threading
+from time import monotonic
+
+
+class LRUCache:
+    """thread-safe cache of at most maxsize values, each kept ttl seconds
+
+    The least recently used value is evicted to make room for a new one.
+    Values are set with tags, invalidate(tag) drops all those having it.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        """Instantiate a LRUCache object"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # ordered dictionary - key: (expiry time, value, tags), oldest first
+        self.__entries = OrderedDict()
+        # dictionary - tag: set of the keys of the values having it
+        self.__tagged = {}
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        """returns the number of values cached"""
+        return len(self.__entries)
+
+    def get(self, key, default=None):
+        """returns the value of key, default if missing or expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= monotonic():
+                self.__remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=()):
+        """caches value under key, evicting the oldest one if full"""
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            elif len(self.__entries) >= self.maxsize:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+            self.__entries[key] = (monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self.__tagged.setdefault(tag, set()).add(key)
+
+    def __remove(self, key):
+        """drops the value of key"""
+        for tag in self.__entries.pop(key)[2]:
+            keys = self.__tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self.__tagged[tag]
+
+    def invalidate(self, tag):
+        """drops the values having tag"""
+        with self.__lock:
+            for key in list(self.__tagged.get(tag, ())):
+                self.__remove(key)
+
+    def clear(self):
+        """drops every value"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__tagged.clear()
+
+    def stats(self):
+        """returns the size and the hit/miss/eviction counters"""
+        return {"size": len(self.__entries), "maxsize": self.maxsize,
+                "ttl": self.ttl, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations}
@@ -3,99 +3,691 @@
 Contains the class DBStorage
 """
 
+from contextlib import contextmanager
+from itertools import cycle
 from models.base_model import Base
 from models.amenity import Amenity
 from models.city import City
+from models.engine.amenity_index import AmenityIndex
+from models.engine.cache import LRUCache
+from models.engine.events import EventBus
+from models.engine.loading import load_paths
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, inspect, or_, \
+    select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import RelationshipProperty, Session, joinedload, \
+    make_transient_to_detached, scoped_session, selectinload, \
+    sessionmaker, subqueryload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import QueuePool, StaticPool
+import threading
+from time import monotonic
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# loader option of each load= strategy
+loaders = {"selectin": selectinload, "joined": joinedload,
+           "subquery": subqueryload}
+
+# create_engine() pool arguments: (environment variable, type)
+pool_settings = {"pool_size": ("HBNB_MYSQL_POOL_SIZE", int),
+                 "max_overflow": ("HBNB_MYSQL_MAX_OVERFLOW", int),
+                 "pool_recycle": ("HBNB_MYSQL_POOL_RECYCLE", int),
+                 "pool_pre_ping": ("HBNB_MYSQL_POOL_PRE_PING", bool),
+                 "pool_timeout": ("HBNB_MYSQL_POOL_TIMEOUT", float)}
+
+# PRAGMA statements run on every new SQLite connection
+sqlite_pragmas = ["journal_mode=WAL", "synchronous=NORMAL",
+                  "foreign_keys=ON", "busy_timeout=5000",
+                  "temp_store=MEMORY"]
+
+
+def pool_options(pool=None):
+    """returns the create_engine() pool arguments set in the environment,
+    overridden by the pool dictionary"""
+    options = {}
+    for option, (variable, kind) in pool_settings.items():
+        value = getenv(variable)
+        if value is not None:
+            if kind is bool:
+                options[option] = value.lower() in ("1", "true", "yes")
+            else:
+                options[option] = kind(value)
+    options.update(pool or {})
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """runs sqlite_pragmas on a new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas:
+        cursor.execute("PRAGMA " + pragma)
+    cursor.close()
+
+
+def make_engine(url, pool=None):
+    """returns the engine of the SQLAlchemy url with the pool settings
+
+    SQLite connections may be shared between threads and get the
+    sqlite_pragmas, in-memory databases use a single connection.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, poolclass=TimedQueuePool,
+                             **pool_options(pool))
+    if url.database in (None, "", ":memory:"):
+        engine = create_engine(url, poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url, poolclass=TimedQueuePool,
+                               connect_args={"check_same_thread": False},
+                               **pool_options(pool))
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording the time spent getting connections"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool object"""
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_time = 0.0
+
+    def _do_get(self):
+        """gets a connection, timing how long it takes"""
+        start = monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkouts += 1
+            self.wait_time += monotonic() - start
+
+
+class RoutingSession(Session):
+    """Session reading from a replica and writing to the primary
+
+    Flushes, DML statements and every statement of a session flagged
+    with info["primary"] (set after a write, until the session is
+    closed) go to the primary engine, so a request reads its own writes.
+    Other reads go to the replica engine returned by the replica
+    callable, chosen once per session.
+    """
+
+    def __init__(self, bind=None, replica=None, **kwargs):
+        """Instantiate a RoutingSession object bound to the primary"""
+        super().__init__(bind=bind, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine the statement clause must run on"""
+        if self.replica is None or self._flushing or \
+                self.info.get("primary") or getattr(clause, "is_dml", False):
+            return self.bind
+        if "replica" not in self.info:
+            self.info["replica"] = self.replica()
+        return self.info["replica"]
+
+    def close(self):
+        """closes the session, forgetting its replica and stickiness"""
+        super().close()
+        self.info.pop("primary", None)
+        self.info.pop("replica", None)
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    __batch = None
+    __amenity_index = None
+    __indexed_at = None
+    __counts = None
+    __counted_at = None
+    __replicas = []
+    __cache = None
+    events = None
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
+    def __init__(self, pool=None, replicas=None, policy=None,
+                 cache_size=None, cache_ttl=None):
+        """Instantiate a DBStorage object, set up by the HBNB_* variables
+        unless the pool settings, replica URLs and policy or object cache
+        size and TTL are given"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
+        self.__count_refresh = float(getenv('HBNB_COUNT_REFRESH', 60))
+        self.__index_refresh = float(getenv('HBNB_AMENITY_INDEX_REFRESH',
+                                            60))
         charset = "latin1"
         connection_string = (
             'mysql+mysqldb://{user}:{password}@{host}/{db}?charset={charset}')
-        self.__engine = create_engine(connection_string.format(
+        url = getenv('HBNB_DB_URL') or connection_string.format(
             user=HBNB_MYSQL_USER,
             password=HBNB_MYSQL_PWD,
             host=HBNB_MYSQL_HOST,
             db=HBNB_MYSQL_DB,
             charset=charset
-        ))
+        )
+        self.__engine = make_engine(url, pool)
+        if replicas is None:
+            replicas = getenv('HBNB_DB_REPLICA_URLS', '').split(',')
+        self.__replicas = [make_engine(replica.strip(), pool)
+                           for replica in replicas if replica.strip()]
+        self.__replica_policy = policy or \
+            getenv('HBNB_DB_REPLICA_POLICY', 'round_robin')
+        if self.__replica_policy not in ("round_robin", "least_loaded"):
+            raise ValueError("Unknown replica policy: " +
+                             self.__replica_policy)
+        self.__replica_cycle = cycle(self.__replicas)
+        # thread local - depth of the nested batch() blocks of the thread
+        # and whether save() was called in them, as sessions are per thread
+        self.__batch = threading.local()
+        self.events = EventBus()
+        self.events.subscribe(self.__count, events=("create", "delete"))
+        if cache_size is None:
+            cache_size = int(getenv('HBNB_DB_CACHE_SIZE', 0))
+        if cache_ttl is None:
+            cache_ttl = float(getenv('HBNB_DB_CACHE_TTL', 60))
+        if cache_size > 0:
+            self.__cache = LRUCache(cache_size, cache_ttl)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def __replica(self):
+        """returns the replica engine a new session reads from"""
+        if self.__replica_policy == "least_loaded":
+            return min(self.__replicas, key=lambda engine: getattr(
+                engine.pool, "checkedout", lambda: 0)())
+        return next(self.__replica_cycle)
+
+    def __connect(self):
+        """returns a connection outside of the transaction of the session
+        to the database it reads from: a replica unless it sticks to the
+        primary"""
+        if self.__replicas and not self.__session.info.get("primary"):
+            return self.__replica().connect()
+        return self.__engine.connect()
+
+    def __stick(self):
+        """sends the reads of the current session to the primary"""
+        if self.__replicas:
+            self.__session.info["primary"] = True
+
+    def all(self, cls=None, order_by=None, limit=None, after=None,
+            load=None, **filters):
+        """query on the current database session
+
+        Keyword arguments filter on equal column values, order_by names
+        the column(s) to sort on, prefixed by '-' for descending order, and
+        limit caps the number of rows fetched per class, all in SQL.
+        after is a tuple of values of the ascending order_by columns, only
+        rows sorting after it are fetched. load names the relationships
+        to eager load, see load_paths().
+        Classes without one of the filtered columns are skipped.
+        Without load, the result is cached if a cache is set.
+        """
+        name = cls if cls is None or isinstance(cls, str) else cls.__name__
+        key = None
+        if self.__cached(load):
+            key = ("all", name, order_by, limit, after,
+                   tuple(sorted(filters.items())))
+            try:
+                cached = self.__cache.get(key)
+            except TypeError:
+                key = cached = None
+            if cached is not None:
+                return {k: self.__merge(copy) for k, copy in cached.items()}
         new_dict = {}
         for clss in classes:
-            if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    key = obj.__class__.__name__ + '.' + obj.id
-                    new_dict[key] = obj
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__query(classes[clss], order_by, limit, filters,
+                                     after, load, strict=cls is not None)
+                if query is None:
+                    continue
+                for obj in query:
+                    new_dict[obj.__class__.__name__ + '.' + obj.id] = obj
+        if key is not None:
+            self.__cache_set(key, new_dict, (name,) if name else classes)
         return (new_dict)
 
+    def __cached(self, load):
+        """tells if a read without relationships to load goes through the
+        cache, not when the session sticks to the primary database"""
+        return self.__cache is not None and not load and \
+            not self.__session.info.get("primary")
+
+    def __cache_set(self, key, objs, tags):
+        """caches detached copies of the dictionary objs under key, unless
+        one of them has changes not flushed"""
+        copies = {}
+        for k, obj in objs.items():
+            state = inspect(obj)
+            if state.pending or state.modified:
+                return
+            copy = state.mapper.class_manager.new_instance()
+            for attr in state.mapper.column_attrs:
+                set_committed_value(copy, attr.key, getattr(obj, attr.key))
+            make_transient_to_detached(copy)
+            copies[k] = copy
+        self.__cache.set(key, copies, tuple(tags))
+
+    def __merge(self, copy):
+        """returns the object of the session of the cached copy, added
+        without a query if the session does not have it yet"""
+        obj = self.__session.identity_map.get(inspect(copy).key)
+        if obj is not None:
+            return obj
+        return self.__session.merge(copy, load=False)
+
+    def __invalidate(self, changes):
+        """drops the cached objects of the classes of the (event type,
+        object) changes"""
+        if self.__cache is not None:
+            for name in {obj.__class__.__name__ for type, obj in changes}:
+                self.__cache.invalidate(name)
+
+    def __flushed(self, session, flush_context):
+        """records the (event type, object) changes of a flush until
+        commit and drops the cached objects of their classes"""
+        changes = [("create", obj) for obj in session.new]
+        changes += [("update", obj) for obj in session.dirty
+                    if session.is_modified(obj)]
+        changes += [("delete", obj) for obj in session.deleted]
+        session.info.setdefault("changes", []).extend(changes)
+        session.info.setdefault("amenity_index", []).extend(
+            self.__links(session))
+        self.__invalidate(changes)
+
+    def __links(self, session):
+        """returns the (method, args) calls to make to the amenity index
+        for the links, places and amenities flushed by session"""
+        calls = []
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Place):
+                history = inspect(obj).attrs.amenities.history
+                calls += [("add", (obj.id, amenity.id))
+                          for amenity in history.added or ()]
+                calls += [("remove", (obj.id, amenity.id))
+                          for amenity in history.deleted or ()]
+            elif isinstance(obj, Amenity):
+                history = inspect(obj).attrs.place_amenities.history
+                calls += [("add", (place.id, obj.id))
+                          for place in history.added or ()]
+                calls += [("remove", (place.id, obj.id))
+                          for place in history.deleted or ()]
+        for obj in session.deleted:
+            if isinstance(obj, Place):
+                calls.append(("remove", (obj.id,)))
+            elif isinstance(obj, Amenity):
+                calls.append(("remove_amenity", (obj.id,)))
+        return calls
+
+    def __committed(self, session):
+        """keeps the changes of a commit for save() to emit them, drops
+        again the cached objects of their classes, fetched in the
+        meantime, and applies its amenity links to the index"""
+        changes = session.info.pop("changes", [])
+        session.info.setdefault("committed", []).extend(changes)
+        self.__invalidate(changes)
+        index = self.__amenity_index
+        for method, args in session.info.pop("amenity_index", []):
+            if index is not None:
+                getattr(index, method)(*args)
+
+    def __rolled_back(self, session):
+        """forgets the changes flushed by a rolled back transaction and
+        its amenity links, drops again the cached objects of their
+        classes"""
+        self.__invalidate(session.info.pop("changes", []))
+        session.info.pop("amenity_index", None)
+
+    def version(self, *classes):
+        """
+        Version of the saved objects of classes, bumped by each event
+        emitted for one of them.
+        :param classes: Classes or class names, all of them if none.
+        :return: Sum of the numbers of events of each class.
+        """
+        return self.events.version(*classes)
+
+    def cache_stats(self):
+        """returns the statistics of the cache, None without a cache"""
+        return None if self.__cache is None else self.__cache.stats()
+
+    def __query(self, cls, order_by=None, limit=None, filters=None,
+                after=None, load=None, strict=True):
+        """builds the query of all() for cls, None if it can't apply"""
+        query = self.__session.query(cls)
+        if load:
+            query = query.options(*self.__load_options(cls, load, strict))
+        if filters:
+            if not all(hasattr(cls, attr) for attr in filters):
+                return None
+            query = query.filter_by(**filters)
+        return self.__page(query, cls, order_by, limit, after)
+
+    def __load_options(self, cls, load, strict=True):
+        """returns the loader options eager loading the load of cls
+
+        A relationship cls doesn't have raises a ValueError if strict,
+        else the path is ignored.
+        """
+        options = []
+        for path, strategy in load_paths(load).items():
+            option = None
+            clss = cls
+            for attr in path:
+                relationship = getattr(clss, attr, None)
+                if not isinstance(getattr(relationship, "property", None),
+                                  RelationshipProperty):
+                    if strict:
+                        raise ValueError("{} has no relationship {}".format(
+                            clss.__name__, attr))
+                    option = None
+                    break
+                loader = loaders[strategy]
+                option = loader(relationship) if option is None else \
+                    getattr(option, loader.__name__)(relationship)
+                clss = relationship.property.mapper.class_
+            if option is not None:
+                options.append(option)
+        return options
+
+    def __page(self, query, cls, order_by=None, limit=None, after=None):
+        """sorts query on order_by, after the values after and limits it"""
+        if isinstance(order_by, str):
+            order_by = (order_by,)
+        if after is not None:
+            columns = [getattr(cls, attr) for attr in order_by]
+            query = query.filter(or_(*[
+                and_(*[column == value for column, value
+                       in zip(columns[:i], after[:i])], columns[i] > after[i])
+                for i in range(len(columns))]))
+        if order_by:
+            for attr in order_by:
+                column = getattr(cls, attr.lstrip('-'))
+                query = query.order_by(
+                    column.desc() if attr.startswith('-') else column)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def search_places(self, states=None, cities=None, amenities=None,
+                      order_by=("created_at", "id"), limit=None, after=None,
+                      chunk_size=None):
+        """
+        Searches places with a single SQL query.
+        :param states: IDs of states whose cities' places are wanted.
+        :param cities: IDs of cities whose places are wanted.
+        :param amenities: IDs of amenities the places must all have.
+        :param chunk_size: If set, an iterator of the places fetched
+        chunk_size rows at a time is returned instead.
+        :return: Dictionary of the places found, sorted on order_by.
+        """
+        query = self.__session.query(Place)
+        if states or cities:
+            in_cities = []
+            if states:
+                in_cities.append(Place.city_id.in_(
+                    select(City.id).where(City.state_id.in_(states))))
+            if cities:
+                in_cities.append(Place.city_id.in_(cities))
+            query = query.filter(or_(*in_cities))
+        if amenities:
+            amenities = set(amenities)
+            place_amenity = Base.metadata.tables["place_amenity"]
+            query = query.filter(Place.id.in_(
+                select(place_amenity.c.place_id)
+                .where(place_amenity.c.amenity_id.in_(amenities))
+                .group_by(place_amenity.c.place_id)
+                .having(func.count() == len(amenities))))
+        query = self.__page(query, Place, order_by, limit, after)
+        if chunk_size:
+            return iter(query.yield_per(chunk_size))
+        return {'Place.' + obj.id: obj for obj in query}
+
+    def iterate(self, cls, order_by=None, chunk_size=1000, **filters):
+        """
+        Iterates over the objects of cls matching filters, see all().
+        :param cls: Class or class name.
+        :param chunk_size: Number of rows fetched at a time.
+        :return: Iterator of the objects.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__query(cls, order_by, filters=filters)
+        if query is None:
+            return iter(())
+        return iter(query.yield_per(chunk_size))
+
+    def __amenities(self):
+        """returns the AmenityIndex of place_amenity, loading it from the
+        committed rows if needed or older than the refresh interval"""
+        if self.__amenity_index is None or \
+                monotonic() - self.__indexed_at > self.__index_refresh:
+            place_amenity = Base.metadata.tables["place_amenity"]
+            with self.__connect() as connection:
+                self.__amenity_index = AmenityIndex(connection.execute(
+                    select(place_amenity.c.place_id,
+                           place_amenity.c.amenity_id)))
+            self.__indexed_at = monotonic()
+        return self.__amenity_index
+
+    def places_with_amenities(self, amenity_ids, match="all"):
+        """
+        Fetches places from the amenity bitmap index.
+        :param amenity_ids: IDs of amenities.
+        :param match: "all" for places having all of them, "any" for any.
+        :return: Dictionary of the places found.
+        """
+        index = self.__amenities()
+        if match == "any":
+            place_ids = index.any_of(amenity_ids)
+        else:
+            place_ids = index.all_of(amenity_ids)
+        if not place_ids:
+            return {}
+        query = self.__session.query(Place).filter(Place.id.in_(place_ids))
+        return {'Place.' + obj.id: obj for obj in query}
+
+    def link_amenity(self, place, amenity):
+        """adds amenity to the amenities of place"""
+        self.__stick()
+        if amenity not in place.amenities:
+            place.amenities.append(amenity)
+
+    def unlink_amenity(self, place, amenity):
+        """removes amenity from the amenities of place"""
+        self.__stick()
+        if amenity in place.amenities:
+            place.amenities.remove(amenity)
+
     def new(self, obj):
         """add the object to the current database session"""
+        self.__stick()
         self.__session.add(obj)
 
-    def get(self, cls, id):
+    def bulk_new(self, objs):
+        """add every object of the iterable objs to the session"""
+        self.__stick()
+        self.__session.add_all(objs)
+
+    def bulk_save(self, objs, chunk_size=1000):
+        """insert every object of objs through the bulk insert path
+
+        Objects are flushed chunk_size at a time then committed at once.
+        They are not attached to the session, so their relationships are
+        not saved.
+        """
+        chunk = []
+        for obj in objs:
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                self.__bulk_flush(chunk)
+                chunk = []
+        self.__bulk_flush(chunk)
+        self.save()
+
+    def __bulk_flush(self, objs):
+        """sends one chunk of bulk_save() to the database"""
+        self.__stick()
+        self.__session.bulk_save_objects(objs)
+        changes = [("create", obj) for obj in objs]
+        self.__session.info.setdefault("changes", []).extend(changes)
+        self.__invalidate(changes)
+        for obj in objs:
+            obj._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """defers save() until the end of the with block
+
+        The session is rolled back if the block raises an exception.
+        """
+        batch = self.__batch
+        batch.depth = getattr(batch, "depth", 0) + 1
+        try:
+            yield self
+        except BaseException:
+            batch.depth -= 1
+            if not batch.depth:
+                batch.saved = False
+                self.__session.rollback()
+            raise
+        batch.depth -= 1
+        if not batch.depth and getattr(batch, "saved", False):
+            batch.saved = False
+            self.save()
+
+    def get(self, cls, id, load=None):
         """
         Fetches specific object.
         :param cls: Class of object.
         :param id: ID of object.
+        :param load: Relationships to eager load, see load_paths().
         :return: Found object or None.
         """
-        return self.__session.query(cls).get(id)
+        if isinstance(cls, str):
+            cls = classes[cls]
+        key = None
+        if self.__cached(load):
+            key = ("get", cls.__name__, id)
+            cached = self.__cache.get(key)
+            if cached is not None:
+                return self.__merge(cached[id])
+        query = self.__session.query(cls)
+        if load:
+            query = query.options(*self.__load_options(cls, load))
+        obj = query.get(id)
+        if key is not None and obj is not None:
+            self.__cache_set(key, {id: obj}, (cls.__name__,))
+        return obj
 
     def count(self, cls=None):
         """
         Count of how many instances of a class.
+        The counts are read on their own connection, so that the rows
+        flushed but not committed by the session are only counted once
+        their create events are emitted.
         :param cls: Class.
-        :return: Count of instances of a class.
+        :return: Count of instances of a class, 0 if it is not stored.
         """
+        if self.__counts is None or \
+                monotonic() - self.__counted_at > self.__count_refresh:
+            with self.__connect() as connection:
+                self.__counts = {
+                    name: connection.execute(select(func.count()).select_from(
+                        clss.__table__)).scalar()
+                    for name, clss in classes.items()}
+            self.__counted_at = monotonic()
         if cls:
-            return self.__session.query(cls).count()
+            return self.__counts.get(cls if isinstance(cls, str)
+                                     else cls.__name__, 0)
         else:
-            count = 0
-            for clss in classes.values():
-                count += self.__session.query(clss).count()
-            return count
+            return sum(self.__counts.values())
+
+    def __count(self, event):
+        """applies a committed insert or delete to the counts"""
+        if self.__counts is not None and event.name in self.__counts:
+            self.__counts[event.name] += 1 if event.type == "create" else -1
+
+    def mark_dirty(self, obj, attr=None):
+        """the session already tracks changes to the objects it holds,
+        later reads of the session go to the primary"""
+        self.__stick()
+
+    def dirty(self):
+        """returns the new and changed objects of the session by key"""
+        return {obj.__class__.__name__ + '.' + obj.id: obj
+                for obj in list(self.__session.new) +
+                list(self.__session.dirty)}
 
     def save(self):
         """commit all changes of the current database session"""
+        self.__stick()
+        if getattr(self.__batch, "depth", 0):
+            self.__batch.saved = True
+            return
+        changed = self.dirty().values()
         self.__session.commit()
+        for obj in changed:
+            obj._dirty = False
+        for type, obj in self.__session.info.pop("committed", []):
+            self.events.emit(type, obj)
+        self.events.flush()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
+            self.__stick()
             self.__session.delete(obj)
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        sess_factory = sessionmaker(
+            bind=self.__engine, class_=RoutingSession,
+            replica=self.__replica if self.__replicas else None,
+            expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_rollback", self.__rolled_back)
+        if self.__cache is not None:
+            self.__cache.clear()
         Session = scoped_session(sess_factory)
         self.__session = Session
+        self.__counts = None
+
+    def pool_stats(self):
+        """returns the state of the connection pools, the primary one with
+        the list of those of the replicas as "replicas", if any"""
+        stats = self.__pool_stats(self.__engine)
+        if self.__replicas:
+            stats["replicas"] = [self.__pool_stats(engine)
+                                 for engine in self.__replicas]
+        return stats
+
+    def __pool_stats(self, engine):
+        """returns the state of the connection pool of engine"""
+        pool = engine.pool
+        stats = {"class": pool.__class__.__name__, "status": pool.status()}
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_in=pool.checkedin(),
+                         checked_out=pool.checkedout(),
+                         overflow=pool.overflow())
+        if isinstance(pool, TimedQueuePool):
+            stats.update(checkouts=pool.checkouts, wait_time=pool.wait_time)
+        return stats
 
     def close(self):
         """call remove() method on the private session attribute"""
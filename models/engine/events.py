@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the Event and EventBus classes
+"""
+from collections import namedtuple
+import queue
+import threading
+import traceback
+
+# type - "create", "update" or "delete", name - class name of the object,
+# key - <class name>.id, obj - the object, None if it was not loaded.
+# key is None too when objects of the class changed but which is unknown
+Event = namedtuple("Event", ["type", "name", "key", "obj"])
+types = ("create", "update", "delete")
+modes = ("sync", "batch", "async")
+
+
+class EventBus:
+    """in-process bus of the changes of the objects of a storage
+
+    The storage emits an event for each object created, updated or
+    deleted, once the change is saved. Subscribers get them:
+    - "sync": callback(event) at once, in the thread saving
+    - "batch": callback(events) with the list of those of a whole save,
+      when the storage calls flush()
+    - "async": callback(event) later, in a worker thread
+    """
+
+    def __init__(self):
+        """Instantiate an EventBus object"""
+        # list - (callback, class name or None, types, mode)
+        self.__subscribers = []
+        # list - (callback, event) to deliver at the next flush()
+        self.__batched = []
+        self.__lock = threading.Lock()
+        self.__queue = None
+        # dictionary - class name: number of events emitted
+        self.__versions = {}
+
+    def subscribe(self, callback, cls=None, events=None, mode="sync"):
+        """delivers to callback the events of cls (a class or a class
+        name, all of them if None) of the types events (one or a list of
+        them, all of them if None), as mode says, returns callback"""
+        if mode not in modes:
+            raise ValueError("Unknown delivery mode: {}".format(mode))
+        if events is None:
+            events = types
+        elif isinstance(events, str):
+            events = (events,)
+        for event in events:
+            if event not in types:
+                raise ValueError("Unknown event: {}".format(event))
+        name = cls if cls is None or isinstance(cls, str) else cls.__name__
+        with self.__lock:
+            self.__subscribers.append((callback, name, tuple(events), mode))
+        return callback
+
+    def unsubscribe(self, callback):
+        """stops delivering events to callback"""
+        with self.__lock:
+            self.__subscribers = [subscriber
+                                  for subscriber in self.__subscribers
+                                  if subscriber[0] != callback]
+
+    def emit(self, type, obj=None, key=None, name=None):
+        """delivers the event type of obj, whose key is given when obj is
+        None, or of unknown objects of the class name"""
+        if key is None and obj is not None:
+            key = obj.__class__.__name__ + "." + obj.id
+        if name is None:
+            name = key.split(".")[0]
+        event = Event(type, name, key, obj)
+        with self.__lock:
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+        for callback, cls, events, mode in self.__subscribers:
+            if type not in events or cls not in (None, name):
+                continue
+            if mode == "sync":
+                callback(event)
+            elif mode == "batch":
+                with self.__lock:
+                    self.__batched.append((callback, event))
+            else:
+                self.__worker().put((callback, event))
+
+    def version(self, *classes):
+        """returns the number of events of classes (classes or class
+        names, all of them if none)"""
+        names = [cls if isinstance(cls, str) else cls.__name__
+                 for cls in classes]
+        if not names:
+            return sum(self.__versions.values())
+        return sum(self.__versions.get(name, 0) for name in names)
+
+    def flush(self):
+        """delivers the batched events, in one list per subscriber"""
+        with self.__lock:
+            batched, self.__batched = self.__batched, []
+        events = {}
+        for callback, event in batched:
+            events.setdefault(callback, []).append(event)
+        for callback, callback_events in events.items():
+            callback(callback_events)
+
+    def discard(self):
+        """drops the batched events not delivered yet"""
+        with self.__lock:
+            self.__batched = []
+
+    def __worker(self):
+        """returns the queue of the async events, starting its thread"""
+        with self.__lock:
+            if self.__queue is None:
+                self.__queue = queue.Queue()
+                threading.Thread(target=self.__deliver, daemon=True).start()
+        return self.__queue
+
+    def __deliver(self):
+        """delivers the async events, printing the errors of callbacks"""
+        while True:
+            callback, event = self.__queue.get()
+            try:
+                callback(event)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self.__queue.task_done()
+
+    def join(self):
+        """waits until the async events emitted so far are delivered"""
+        if self.__queue is not None:
+            self.__queue.join()
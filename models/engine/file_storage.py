@@ -3,45 +3,406 @@
 Contains the FileStorage class
 """
 
+from contextlib import contextmanager
+from datetime import datetime
+import heapq
 import json
+import os
+from os import getenv
+import threading
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.engine.amenity_index import AmenityIndex
+from models.engine.events import EventBus
+from models.engine.loading import load_paths
+from models.engine.snapshot import Snapshot, atomic_write
+from models.base_model import BaseModel, time
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# attributes of each class holding the id(s) of related objects
+relations = {"City": ("state_id",),
+             "Place": ("city_id", "user_id", "amenity_ids"),
+             "Review": ("place_id", "user_id")}
+
+# relationship properties of each class: (class of the related objects,
+# attribute of theirs holding the id, None if held by the class itself)
+relationships = {"City": {"places": ("Place", "city_id")},
+                 "Place": {"amenities": ("Amenity", None),
+                           "reviews": ("Review", "place_id")},
+                 "State": {"cities": ("City", "state_id")},
+                 "User": {"places": ("Place", "user_id"),
+                          "reviews": ("Review", "user_id")}}
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # string - format of the file: "json" or "snapshot", see Snapshot
+    __format = getenv("HBNB_FILE_FORMAT", "json")
+    # string - path to the file
+    __file_path = "file.hbnb" if __format == "snapshot" else "file.json"
+    # string - path to the append-only journal, None to rewrite the file
+    __journal_path = __file_path + ".journal" if getenv("HBNB_FILE_JOURNAL") \
+        else None
+    # int - number of journal entries after which it is compacted
+    __compact_after = int(getenv("HBNB_FILE_COMPACT_AFTER", 1000))
+    # bool - whether reload() leaves records as is until they are used
+    __lazy = bool(getenv("HBNB_FILE_LAZY"))
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned as <class name>: {key: obj}
+    __by_class = {}
+    # dictionary - records read in lazy mode but not turned into objects
+    # yet, as <class name>: {key: record}
+    __raw = {}
+    # the __objects dictionary __by_class was built from
+    __partitioned = None
+    # dictionary - (class name, attribute in relations): ({id: set of keys},
+    # {key: ids the key is filed under}), built on first use
+    __related = {}
+    # AmenityIndex - Place.amenity_ids inverted, built on first use
+    __amenity_index = None
+    # dictionary - last record read from or written to the file by key
+    __records = {}
+    # dictionary - objects passed to new() or changed since the last save
+    __pending = {}
+    # dictionary - objects deleted since the last save by key, None for
+    # those never loaded
+    __removed = {}
+    # list - (event type, object, key[, class name]) of the changes saved
+    # or read but not emitted yet
+    __received = []
+    # EventBus - where the saved changes of the objects are emitted
+    events = EventBus()
+    # bool - whether the file was read once, the records of the first
+    # read are not changes
+    __loaded = False
+    # (mtime, size, inode) of the file and journal when last read/written
+    __file_stamp = None
+    __journal_stamp = None
+    # int - journal bytes and entries already applied to __objects
+    __journal_offset = 0
+    __journal_entries = 0
+    # thread local - depth of the nested batch() blocks of the thread, save()
+    # waits for the outermost, and whether save() was called in them
+    __batch = threading.local()
+    # thread local - depth of the lock of the file held by the thread
+    __lock_held = threading.local()
+
+    def __stamp(self, path):
+        """returns the (mtime, size, inode) of path or None"""
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @contextmanager
+    def __locked(self, exclusive=True):
+        """holds the advisory lock shared by the processes using the file
+
+        The lock is taken on a file next to it, as the file itself is
+        replaced on save. Nested calls reuse the lock already held.
+        """
+        depth = getattr(self.__lock_held, "depth", 0)
+        if fcntl is None or depth:
+            yield
+            return
+        with open(self.__file_path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self.__lock_held.depth = 1
+            try:
+                yield
+            finally:
+                self.__lock_held.depth = 0
+
+    def __partitions(self):
+        """returns __by_class, rebuilding it if __objects was replaced"""
+        if FileStorage.__partitioned is not self.__objects:
+            FileStorage.__by_class = {}
+            FileStorage.__related = {}
+            FileStorage.__amenity_index = None
+            for key, obj in self.__objects.items():
+                self.__by_class.setdefault(key.split('.')[0], {})[key] = obj
+            FileStorage.__partitioned = self.__objects
+        return self.__by_class
+
+    def __load(self, name=None):
+        """turns the records of class name (all if None) left by a lazy
+        reload into objects"""
+        for clss in list(self.__raw) if name is None else [name]:
+            for key, record in self.__raw.pop(clss, {}).items():
+                self.__add(key, record)
+
+    def __indexed(self, name):
+        """tells if an index of the objects of class name was built"""
+        return any(clss == name for clss, attr in self.__related) or \
+            (name == "Place" and self.__amenity_index is not None)
+
+    def __relation(self, name, attr):
+        """returns the index of the objects of class name by attr"""
+        self.__partitions()
+        relation = self.__related.get((name, attr))
+        if relation is None:
+            self.__load(name)
+            relation = ({}, {})
+            self.__related[(name, attr)] = relation
+            for key, obj in self.__by_class.get(name, {}).items():
+                self.__link(relation, key, obj, attr)
+        return relation
+
+    def __amenities(self):
+        """returns the AmenityIndex of the places, building it if needed"""
+        self.__partitions()
+        if self.__amenity_index is None:
+            self.__load("Place")
+            FileStorage.__amenity_index = AmenityIndex(
+                (obj.id, amenity_id)
+                for obj in self.__by_class.get("Place", {}).values()
+                for amenity_id in obj.amenity_ids)
+        return self.__amenity_index
+
+    def __link(self, relation, key, obj, attr):
+        """files key in relation under the current value(s) of obj.attr"""
+        by_id, by_key = relation
+        for id in by_key.pop(key, ()):
+            by_id[id].discard(key)
+            if not by_id[id]:
+                del by_id[id]
+        if obj is not None:
+            ids = getattr(obj, attr, None)
+            ids = tuple(ids) if isinstance(ids, list) else (ids,)
+            by_key[key] = ids
+            for id in ids:
+                by_id.setdefault(id, set()).add(key)
+
+    def __relink(self, key, obj, attrs=None):
+        """updates the built indexes on obj, or removes key if obj is None"""
+        name = key.split('.')[0]
+        self.__partitions()
+        for attr in relations.get(name, ()):
+            if attrs is not None and attr not in attrs:
+                continue
+            if (name, attr) == ("Place", "amenity_ids"):
+                if self.__amenity_index is not None:
+                    id = key.split('.', 1)[1]
+                    if obj is None:
+                        self.__amenity_index.remove(id)
+                    else:
+                        self.__amenity_index.set(id, obj.amenity_ids)
+                continue
+            relation = self.__related.get((name, attr))
+            if relation is not None:
+                self.__link(relation, key, obj, attr)
+
+    def related(self, cls, attr, id):
+        """
+        Fetches the objects of a class referring to another object.
+        :param cls: Class of the objects.
+        :param attr: Attribute of cls holding the id(s) of related objects.
+        :param id: ID of the related object.
+        :return: Dictionary of the objects whose attr is or contains id.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        if (name, attr) == ("Place", "amenity_ids"):
+            return self.places_with_amenities((id,))
+        by_id = self.__relation(name, attr)[0]
+        return {key: self.__objects[key] for key in by_id.get(id, ())}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def places_with_amenities(self, amenity_ids, match="all"):
+        """
+        Fetches places from the amenity bitmap index.
+        :param amenity_ids: IDs of amenities.
+        :param match: "all" for places having all of them, "any" for any.
+        :return: Dictionary of the places found.
+        """
+        index = self.__amenities()
+        if match == "any":
+            place_ids = index.any_of(amenity_ids)
+        else:
+            place_ids = index.all_of(amenity_ids)
+        return {"Place." + id: self.__objects["Place." + id]
+                for id in place_ids}
+
+    def link_amenity(self, place, amenity):
+        """adds amenity to the amenities of place"""
+        if amenity.id not in place.amenity_ids:
+            place.amenity_ids = place.amenity_ids + [amenity.id]
+
+    def unlink_amenity(self, place, amenity):
+        """removes amenity from the amenities of place"""
+        if amenity.id in place.amenity_ids:
+            place.amenity_ids = [id for id in place.amenity_ids
+                                 if id != amenity.id]
+
+    def all(self, cls=None, order_by=None, limit=None, after=None,
+            load=None, **filters):
+        """returns the dictionary __objects
+
+        Keyword arguments only keep the objects whose attribute equals (or
+        for a list contains) the value, looked up in the relationship
+        indexes when possible. order_by names the attribute(s) to sort on,
+        prefixed by '-' for descending order, and limit caps the number of
+        objects returned. after is a tuple of values of the ascending
+        order_by attributes, only objects sorting after it are returned.
+        load names the relationships whose indexes are built beforehand.
+        """
+        name = None
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            name = cls if isinstance(cls, str) else cls.__name__
+        if load:
+            self.__prefetch(name, load)
+        self.__load(name)
+        if cls is None and not (order_by or limit or after or filters):
+            return self.__objects
+        objs = None
+        for attr in relations.get(name, ()):
+            if attr in filters:
+                found = self.related(name, attr, filters[attr])
+                if objs is None or len(found) < len(objs):
+                    objs = found
+        if objs is None:
+            if name is None:
+                objs = self.__objects
+            else:
+                objs = self.__partitions().get(name, {})
+        items = [(key, obj) for key, obj in objs.items()
+                 if all(self.__matches(obj, attr, value)
+                        for attr, value in filters.items())]
+        return self.__page(items, order_by, limit, after)
+
+    def __prefetch(self, name, load):
+        """builds the relationship indexes the load of class name uses
+
+        A relationship the class doesn't have raises a ValueError, unless
+        name is None in which case every class having it is prefetched.
+        """
+        for path in load_paths(load):
+            for clss in (name,) if name is not None else relationships:
+                for attr in path:
+                    relationship = relationships.get(clss, {}).get(attr)
+                    if relationship is None:
+                        if name is None:
+                            break
+                        raise ValueError("{} has no relationship {}".format(
+                            clss, attr))
+                    clss, id_attr = relationship
+                    if id_attr is not None:
+                        self.__relation(clss, id_attr)
+
+    def __page(self, items, order_by=None, limit=None, after=None):
+        """returns the dictionary of the (key, obj) pairs of items sorted
+        on order_by, after the values after and up to limit of them"""
+        if after is not None:
+            attrs = (order_by,) if isinstance(order_by, str) else order_by
+            after = tuple(after)
+            items = [(key, obj) for key, obj in items
+                     if tuple(getattr(obj, attr) for attr in attrs) > after]
+        if order_by:
+            items = self.__sort(items, order_by, limit)
+        if limit is not None:
+            items = items[:limit]
+        return dict(items)
+
+    def search_places(self, states=None, cities=None, amenities=None,
+                      order_by=("created_at", "id"), limit=None, after=None,
+                      chunk_size=None):
+        """
+        Searches places through the relationship and amenity indexes.
+        :param states: IDs of states whose cities' places are wanted.
+        :param cities: IDs of cities whose places are wanted.
+        :param amenities: IDs of amenities the places must all have.
+        :param chunk_size: If set, an iterator is returned instead.
+        :return: Dictionary of the places found, sorted on order_by.
+        """
+        keys = None
+        if states or cities:
+            city_ids = set(cities or ())
+            for state_id in states or ():
+                city_ids.update(obj.id for obj in
+                                self.related(City, "state_id",
+                                             state_id).values())
+            by_city = self.__relation("Place", "city_id")[0]
+            keys = set()
+            for city_id in city_ids:
+                keys.update(by_city.get(city_id, ()))
+        if amenities:
+            found = self.places_with_amenities(amenities).keys()
+            keys = set(found) if keys is None else keys & found
+        if keys is None:
+            self.__load("Place")
+            objs = self.__partitions().get("Place", {})
+        else:
+            objs = {key: self.__objects[key] for key in keys}
+        places = self.__page(objs.items(), order_by, limit, after)
+        return iter(places.values()) if chunk_size else places
 
-    def get(self, cls, id):
+    def iterate(self, cls, order_by=None, chunk_size=1000, **filters):
+        """
+        Iterates over the objects of cls matching filters, see all().
+        :param cls: Class or class name.
+        :param chunk_size: Unused, the objects are all in memory already.
+        :return: Iterator of the objects.
+        """
+        return iter(self.all(cls, order_by=order_by, **filters).values())
+
+    def __matches(self, obj, attr, value):
+        """tells if obj.attr equals, or for a list contains, value"""
+        current = getattr(obj, attr, None)
+        if isinstance(current, list):
+            return value in current
+        return current == value
+
+    def __sort(self, items, order_by, limit=None):
+        """sorts the (key, obj) pairs of items on the attributes order_by"""
+        if isinstance(order_by, str):
+            order_by = (order_by,)
+        attrs = [attr.lstrip('-') for attr in order_by]
+        descending = [attr.startswith('-') for attr in order_by]
+        if len(set(descending)) == 1:
+            def key(item):
+                return tuple(getattr(item[1], attr, None) for attr in attrs)
+            if limit is not None:
+                pick = heapq.nlargest if descending[0] else heapq.nsmallest
+                return pick(limit, items, key=key)
+            return sorted(items, key=key, reverse=descending[0])
+        for attr, reverse in reversed(list(zip(attrs, descending))):
+            items = sorted(items, key=lambda item: getattr(item[1], attr),
+                           reverse=reverse)
+        return items
+
+    def get(self, cls, id, load=None):
         """
         Fetches specific object.
         :param cls: Class of object.
         :param id: ID of object.
+        :param load: Relationships whose indexes are built beforehand.
         :return: Found object or None.
         """
-        key = "{}.{}".format(cls.__name__, id)
+        name = cls if isinstance(cls, str) else cls.__name__
+        if load:
+            self.__prefetch(name, load)
+        key = "{}.{}".format(name, id)
+        record = self.__raw.get(name, {}).pop(key, None)
+        if record is not None:
+            self.__add(key, record)
         return self.__objects.get(key)
 
     def count(self, cls=None):
@@ -51,42 +412,394 @@ class FileStorage:
         :return: Count of instances of a class.
         """
         if cls:
-            return len([k for k in self.__objects.keys()
-                        if k.startswith(cls.__name__)])
+            name = cls if isinstance(cls, str) else cls.__name__
+            return len(self.__partitions().get(name, {})) + \
+                len(self.__raw.get(name, ()))
         else:
-            return len(self.__objects.keys())
+            return len(self.__objects) + \
+                sum(len(records) for records in self.__raw.values())
+
+    def version(self, *classes):
+        """
+        Version of the saved objects of classes, bumped by each event
+        emitted for one of them.
+        :param classes: Classes or class names, all of them if none.
+        :return: Sum of the numbers of events of each class.
+        """
+        return self.events.version(*classes)
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            self.__raw.get(name, {}).pop(key, None)
             self.__objects[key] = obj
+            self.__partitions().setdefault(name, {})[key] = obj
+            self.__relink(key, obj)
+            self.__pending[key] = obj
+            self.__removed.pop(key, None)
+
+    def bulk_new(self, objs):
+        """sets in __objects every object of the iterable objs"""
+        for obj in objs:
+            self.new(obj)
+
+    def bulk_save(self, objs):
+        """sets in __objects every object of objs then saves them at once"""
+        self.bulk_new(objs)
+        self.save()
+
+    @contextmanager
+    def batch(self):
+        """defers save() until the end of the with block
+
+        If the block raises an exception, the changes made in it are
+        undone, as a rollback of DBStorage would: objects created are
+        dropped, changed or deleted ones put back as last saved.
+        """
+        batch = self.__batch
+        batch.depth = getattr(batch, "depth", 0) + 1
+        if batch.depth == 1:
+            batch.pending = dict(self.__pending)
+            batch.removed = dict(self.__removed)
+        try:
+            yield self
+        except BaseException:
+            batch.depth -= 1
+            if not batch.depth:
+                batch.saved = False
+                self.__rollback(batch.pending, batch.removed)
+            raise
+        batch.depth -= 1
+        if not batch.depth and getattr(batch, "saved", False):
+            batch.saved = False
+            self.save()
+
+    def __rollback(self, pending, removed):
+        """undoes the changes made since __pending and __removed were
+        pending and removed, then restores them"""
+        for key, obj in list(self.__removed.items()):
+            if key in removed:
+                continue
+            del self.__removed[key]
+            record = self.__records.get(key)
+            if obj is None:
+                if record is not None:
+                    self.__raw.setdefault(key.split('.')[0], {})[key] = record
+                continue
+            if key not in pending and record is not None:
+                self.__revert(obj, record)
+            if key in pending or record is not None:
+                self.new(obj)
+        for key, obj in list(self.__pending.items()):
+            if key in pending:
+                continue
+            record = self.__records.get(key)
+            if record is None:
+                self.__drop(key)
+            else:
+                self.__revert(obj, record)
+                self.__relink(key, obj)
+        self.__pending.clear()
+        self.__pending.update(pending)
+        self.__removed.clear()
+        self.__removed.update(removed)
+
+    def __revert(self, obj, record):
+        """sets the attributes of obj back to those of its record"""
+        saved = self.__materialize(record)
+        obj.__dict__.clear()
+        obj.__dict__.update(saved.__dict__)
+        obj._dirty = False
+
+    def mark_dirty(self, obj, attr=None):
+        """records that obj (or its attribute attr) changed since saved"""
+        key = obj.__class__.__name__ + "." + obj.id
+        if self.__objects.get(key) is obj:
+            self.__pending[key] = obj
+            if attr in relations.get(obj.__class__.__name__, ()):
+                self.__relink(key, obj, (attr,))
+
+    def dirty(self):
+        """returns the objects changed since the last save by key"""
+        return dict(self.__pending)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only objects changed since the last save are converted with
+        to_dict(), the others reuse their last written record. With a
+        journal, only those changes and deletions are appended to it.
+        The file is locked meanwhile and the changes saved by other
+        processes since the last read are merged first.
+        """
+        if getattr(self.__batch, "depth", 0):
+            self.__batch.saved = True
+            return
+        with self.__locked():
+            self.close()
+            changes = [("update" if key in self.__records else "create",
+                        obj, key) for key, obj in self.__pending.items()]
+            changes += [("delete", obj, key)
+                        for key, obj in self.__removed.items()
+                        if key in self.__records]
+            if self.__journal_path:
+                self.__append()
+            else:
+                self.__rewrite()
+            self.__received.extend(changes)
+        self.__emit()
+
+    def __emit(self):
+        """emits the events of the changes saved or read"""
+        received = list(self.__received)
+        del self.__received[:]
+        for change in received:
+            self.events.emit(*change)
+        self.events.flush()
+
+    def __rewrite(self):
+        """writes every object to the file"""
         json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        for key, obj in self.__objects.items():
+            record = self.__records.get(key)
+            if record is None or getattr(obj, "_dirty", True):
+                record = obj.to_dict()
+                obj._dirty = False
+            json_objects[key] = record
+        self.__write(json_objects)
+        for raw in self.__raw.values():
+            for key in raw:
+                if key in self.__records:
+                    json_objects[key] = self.__records[key]
+        FileStorage.__records = json_objects
+        self.__pending.clear()
+        self.__removed.clear()
+
+    def __append(self):
+        """appends the pending changes to the journal"""
+        lines = []
+        for key, obj in self.__pending.items():
+            record = obj.to_dict()
+            obj._dirty = False
+            self.__records[key] = record
+            lines.append(json.dumps({"key": key, "record": record}))
+        for key in self.__removed:
+            self.__records.pop(key, None)
+            lines.append(json.dumps({"key": key, "record": None}))
+        self.__pending.clear()
+        self.__removed.clear()
+        if lines:
+            with open(self.__journal_path, 'ab') as f:
+                f.write("".join(line + "\n" for line in lines).encode())
+                f.flush()
+                os.fsync(f.fileno())
+                FileStorage.__journal_offset = f.tell()
+            FileStorage.__journal_entries += len(lines)
+            FileStorage.__journal_stamp = self.__stamp(self.__journal_path)
+        if self.__journal_entries >= self.__compact_after:
+            self.compact()
+
+    def compact(self):
+        """writes the saved records to the file and empties the journal"""
+        with self.__locked():
+            self.__write(self.__records)
+            if self.__journal_path:
+                open(self.__journal_path, 'w').close()
+                FileStorage.__journal_offset = 0
+                FileStorage.__journal_entries = 0
+                FileStorage.__journal_stamp = \
+                    self.__stamp(self.__journal_path)
+
+    def __write(self, records):
+        """writes records, and those left by a lazy reload, to the file"""
+        if self.__format == "snapshot":
+            Snapshot.write(self.__file_path, *self.__raw.values(), records)
+        else:
+            if self.__raw:
+                records = dict(records)
+                for raw in self.__raw.values():
+                    records.update(raw)
+            atomic_write(self.__file_path, [
+                orjson.dumps(records) if orjson else
+                json.dumps(records).encode()])
+        FileStorage.__file_stamp = self.__stamp(self.__file_path)
+
+    def __read(self):
+        """updates __objects from the records of the file, returns them
+
+        In lazy mode, the records of a snapshot are left in it, by class,
+        and decoded only when used.
+        """
+        if self.__format != "snapshot":
+            with open(self.__file_path, 'rb') as f:
+                jo = orjson.loads(f.read()) if orjson else json.load(f)
+            for key, record in jo.items():
+                self.__apply(key, record)
+            return jo
+        snapshot = Snapshot(self.__file_path)
+        if not self.__lazy:
+            for key, record in snapshot.items():
+                self.__apply(key, record)
+            return snapshot
+        for name in snapshot.classes():
+            records = snapshot.records(name)
+            if self.__indexed(name):
+                for key, record in records.items():
+                    self.__apply(key, record)
+                continue
+            for key in list(self.__partitions().get(name, {})):
+                if key in records:
+                    self.__apply(key, records.pop(key))
+            if name in self.__raw:
+                self.__received.append(("update", None, None, name))
+            self.__raw[name] = records
+        return snapshot
+
+    def export_json(self, path):
+        """writes the saved and unsaved objects to the JSON file at path"""
+        records = {}
+        for raw in self.__raw.values():
+            records.update(raw)
+        for key, obj in self.__objects.items():
+            records[key] = obj.to_dict()
+        with open(path, 'w') as f:
+            json.dump(records, f)
+
+    def import_json(self, path):
+        """adds the objects of the JSON file at path then saves them"""
+        with open(path, 'rb') as f:
+            jo = orjson.loads(f.read()) if orjson else json.load(f)
+        for record in jo.values():
+            self.new(self.__materialize(record))
+        self.save()
+
+    def __apply(self, key, record):
+        """updates __objects from a record read from the file or journal,
+        unless the object was changed or deleted and not saved since"""
+        name = key.split('.')[0]
+        if key in self.__pending or key in self.__removed:
+            return
+        changed = self.__records.get(key) != record
+        type = "delete" if record is None else \
+            "update" if key in self.__records else "create"
+        obj = self.__objects.get(key)
+        if record is None:
+            if key in self.__objects:
+                self.__drop(key)
+            self.__raw.get(name, {}).pop(key, None)
+            self.__records.pop(key, None)
+        elif self.__lazy and key not in self.__objects and \
+                not self.__indexed(name):
+            self.__raw.setdefault(name, {})[key] = record
+            self.__records[key] = record
+        elif key not in self.__objects or changed:
+            self.__add(key, record)
+            obj = self.__objects[key]
+        if changed and self.__loaded:
+            self.__received.append((type, obj, key))
+
+    def __add(self, key, record):
+        """sets in __objects the object of a record as saved"""
+        self.new(self.__materialize(record))
+        self.__pending.pop(key, None)
+        self.__records[key] = record
+
+    def __materialize(self, record):
+        """returns the object of a record, bypassing __init__
+
+        The attributes are copied to __dict__ at once and the datetimes
+        parsed by fromisoformat(). Records lacking id or a datetime go
+        through __init__ to get them.
+        """
+        cls = classes[record["__class__"]]
+        if "id" not in record or "created_at" not in record or \
+                "updated_at" not in record:
+            obj = cls(**record)
+            obj._dirty = False
+            return obj
+        attrs = dict(record)
+        del attrs["__class__"]
+        for key in ("created_at", "updated_at"):
+            if isinstance(attrs[key], str):
+                try:
+                    attrs[key] = datetime.fromisoformat(attrs[key])
+                except ValueError:
+                    attrs[key] = datetime.strptime(attrs[key], time)
+        obj = cls.__new__(cls)
+        obj._dirty = False
+        obj.__dict__.update(attrs)
+        return obj
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except FileNotFoundError:
-            pass
+        """deserializes the file to __objects
+
+        Only records that differ from the last ones read or written are
+        turned back into objects, the others keep their current instance,
+        and objects whose record is gone are dropped.
+        If only the journal grew, just its new entries are replayed.
+        """
+        with self.__locked(exclusive=False):
+            self.__reload()
+        self.__emit()
+
+    def __reload(self):
+        """reload() with the file locked"""
+        file_stamp = self.__stamp(self.__file_path)
+        journal_stamp = self.__stamp(self.__journal_path)
+        offset = self.__journal_offset
+        if file_stamp != self.__file_stamp or journal_stamp is None or \
+                self.__journal_stamp is None or \
+                journal_stamp[2] != self.__journal_stamp[2] or \
+                journal_stamp[1] < offset:
+            offset = 0
+            FileStorage.__journal_entries = 0
+            try:
+                records = self.__read()
+            except FileNotFoundError:
+                records = {}
+            for key in list(self.__records):
+                if key not in records:
+                    self.__apply(key, None)
+            FileStorage.__file_stamp = file_stamp
+        if journal_stamp is not None:
+            with open(self.__journal_path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    entry = orjson.loads(line) if orjson else json.loads(line)
+                    self.__apply(entry["key"], entry["record"])
+                    offset += len(line)
+                    FileStorage.__journal_entries += 1
+        FileStorage.__journal_offset = offset
+        FileStorage.__journal_stamp = journal_stamp
+        FileStorage.__loaded = True
+
+    def __drop(self, key):
+        """removes key from __objects and the indexes"""
+        del self.__objects[key]
+        self.__partitions().get(key.split('.')[0], {}).pop(key, None)
+        self.__relink(key, None)
+        self.__pending.pop(key, None)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
             if key in self.__objects:
-                del self.__objects[key]
+                self.__drop(key)
+                self.__removed[key] = obj
+            else:
+                record = self.__raw.get(obj.__class__.__name__, {}).pop(key,
+                                                                        None)
+                if record is not None:
+                    self.__records[key] = record
+                    self.__removed[key] = obj
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method if the JSON file changed since last read"""
+        if self.__stamp(self.__file_path) != self.__file_stamp or \
+                self.__stamp(self.__journal_path) != self.__journal_stamp:
+            self.reload()
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""
+Parses the load= option of storage.all() and storage.get()
+"""
+
+# eager loading strategies, the first one is the default
+strategies = ("selectin", "joined", "subquery")
+
+
+def load_paths(load):
+    """returns the relationships to load as {path: strategy}
+
+    load is a relationship name, an iterable of them or a dictionary of
+    them to their strategy. A name may be a dotted path of relationships,
+    such as "cities.places", split into a tuple.
+    """
+    if not load:
+        return {}
+    if isinstance(load, str):
+        load = {load: strategies[0]}
+    elif not isinstance(load, dict):
+        load = {name: strategies[0] for name in load}
+    paths = {}
+    for name, strategy in load.items():
+        if strategy not in strategies:
+            raise ValueError("Unknown loading strategy: {}".format(strategy))
+        paths[tuple(name.split("."))] = strategy
+    return paths
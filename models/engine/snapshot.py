@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+"""
+Contains the Snapshot and SnapshotRecords classes
+"""
+from collections.abc import MutableMapping
+import json
+import mmap
+import os
+import struct
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# magic bytes, format version and number of records
+header = struct.Struct("<4sHI")
+# offset and length of the key then of the record, of each index entry
+entry = struct.Struct("<QIQI")
+magic = b"HBNB"
+version = 1
+
+
+def encode(record):
+    """returns the compact JSON bytes of a record"""
+    if orjson:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":")).encode()
+
+
+def decode(data):
+    """returns the record of its JSON bytes"""
+    return orjson.loads(data) if orjson else json.loads(bytes(data))
+
+
+def atomic_write(path, chunks):
+    """writes the bytes chunks to path
+
+    They go to a temporary file, synced to disk then renamed over path,
+    so readers find either the old file or the new one, whole.
+    """
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(path) or ".",
+                     os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class Snapshot:
+    """read-only memory map of a snapshot file of records by key
+
+    The file holds a header, an index of one entry per record sorted by
+    key, then the keys and the records. A record is found by a binary
+    search of the index and decoded alone, and the pages are shared by
+    all the processes mapping the file.
+    """
+
+    def __init__(self, path):
+        """maps the snapshot file at path"""
+        with open(path, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        file_magic, file_version, self.__count = \
+            header.unpack_from(self.__map, 0)
+        if file_magic != magic or file_version != version:
+            self.__map.close()
+            raise ValueError("Not a snapshot file: {}".format(path))
+
+    def __len__(self):
+        """returns the number of records"""
+        return self.__count
+
+    def __contains__(self, key):
+        """tells if there is a record of key"""
+        return self.find(key) != -1
+
+    def __entry(self, i):
+        """returns the index entry i"""
+        return entry.unpack_from(self.__map, header.size + i * entry.size)
+
+    def __key(self, i):
+        """returns the encoded key of the index entry i"""
+        key_offset, key_length = self.__entry(i)[:2]
+        return self.__map[key_offset:key_offset + key_length]
+
+    def key(self, i):
+        """returns the key of the index entry i"""
+        return self.__key(i).decode()
+
+    def bound(self, key, lo=0, hi=None):
+        """returns the index of the first key not lower than key"""
+        key = key.encode()
+        hi = self.__count if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key, lo=0, hi=None):
+        """returns the index of key, -1 if missing"""
+        i = self.bound(key, lo, hi)
+        if i < (self.__count if hi is None else hi) and self.key(i) == key:
+            return i
+        return -1
+
+    def encoded(self, i):
+        """returns the encoded record of the index entry i"""
+        offset, length = self.__entry(i)[2:]
+        return self.__map[offset:offset + length]
+
+    def get(self, key):
+        """returns the record of key, None if missing"""
+        i = self.find(key)
+        return None if i == -1 else decode(self.encoded(i))
+
+    def classes(self):
+        """returns the class names of the keys with their index range"""
+        ranges = {}
+        i = 0
+        while i < self.__count:
+            name = self.key(i).split(".")[0]
+            end = self.bound(name + "/", i)
+            ranges[name] = (i, end)
+            i = end
+        return ranges
+
+    def records(self, name):
+        """returns the SnapshotRecords of the class name"""
+        lo, hi = self.classes().get(name, (0, 0))
+        return SnapshotRecords(self, lo, hi)
+
+    def items(self):
+        """yields every (key, record)"""
+        for i in range(self.__count):
+            yield self.key(i), decode(self.encoded(i))
+
+    def close(self):
+        """unmaps the file"""
+        self.__map.close()
+
+    @staticmethod
+    def write(path, *mappings):
+        """writes the records of mappings to the snapshot file at path
+
+        Records are dictionaries, or their encoded bytes. A key of a
+        mapping overrides those of the previous ones. The file is
+        replaced by atomic_write(), so readers mapping it are unharmed.
+        """
+        records = {}
+        for mapping in mappings:
+            if isinstance(mapping, SnapshotRecords):
+                records.update(mapping.encoded_items())
+            else:
+                records.update(mapping)
+        keys = sorted((key.encode(), key) for key in records)
+        offset = header.size + len(keys) * entry.size
+        index = []
+        data = []
+        for key, name in keys:
+            record = records[name]
+            if not isinstance(record, (bytes, memoryview)):
+                record = encode(record)
+            index.append(entry.pack(offset, len(key),
+                                    offset + len(key), len(record)))
+            data += [key, record]
+            offset += len(key) + len(record)
+        atomic_write(path, [header.pack(magic, version, len(keys)),
+                            b"".join(index), b"".join(data)])
+
+
+class SnapshotRecords(MutableMapping):
+    """records of one class of a Snapshot, by key, decoded when read
+
+    Keys set or deleted afterwards are kept aside, the snapshot itself
+    is never changed.
+    """
+
+    def __init__(self, snapshot, lo, hi):
+        """Instantiate the records of the index entries lo to hi"""
+        self.__snapshot = snapshot
+        self.__lo = lo
+        self.__hi = hi
+        # set - keys of the snapshot deleted or set since
+        self.__removed = set()
+        # dictionary - records set since, by key
+        self.__added = {}
+
+    def __find(self, key):
+        """returns the index of key in the snapshot, -1 if missing"""
+        if key in self.__removed:
+            return -1
+        return self.__snapshot.find(key, self.__lo, self.__hi)
+
+    def __contains__(self, key):
+        """tells if there is a record of key"""
+        return key in self.__added or self.__find(key) != -1
+
+    def __getitem__(self, key):
+        """returns the record of key"""
+        if key in self.__added:
+            return self.__added[key]
+        i = self.__find(key)
+        if i == -1:
+            raise KeyError(key)
+        return decode(self.__snapshot.encoded(i))
+
+    def __setitem__(self, key, record):
+        """sets the record of key"""
+        if self.__find(key) != -1:
+            self.__removed.add(key)
+        self.__added[key] = record
+
+    def __delitem__(self, key):
+        """deletes the record of key"""
+        if key in self.__added:
+            del self.__added[key]
+        elif self.__find(key) != -1:
+            self.__removed.add(key)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        """yields the keys"""
+        for i in range(self.__lo, self.__hi):
+            key = self.__snapshot.key(i)
+            if key not in self.__removed:
+                yield key
+        yield from list(self.__added)
+
+    def __len__(self):
+        """returns the number of records"""
+        return self.__hi - self.__lo - len(self.__removed) + \
+            len(self.__added)
+
+    def encoded_items(self):
+        """yields every (key, record), still encoded if unchanged"""
+        for i in range(self.__lo, self.__hi):
+            key = self.__snapshot.key(i)
+            if key not in self.__removed:
+                yield key, self.__snapshot.encoded(i)
+        yield from self.__added.items()
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompressionDocs and TestCompression classes
+"""
+
+from api.v1 import compression
+from api.v1.app import app
+import gzip
+import inspect
+from models import storage
+from models.state import State
+import pep8
+import unittest
+
+
+class TestCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compression.py"""
+    def test_pep8_conformance_compression(self):
+        """Test that api/v1/compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compression(self):
+        """Test tests/test_api/test_v1/test_compression.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compression_module_docstring(self):
+        """Test for the compression.py module docstring"""
+        self.assertIsNot(compression.__doc__, None,
+                         "compression.py needs a docstring")
+        self.assertTrue(len(compression.__doc__) >= 1,
+                        "compression.py needs a docstring")
+
+    def test_compression_func_docstrings(self):
+        """Test for the presence of docstrings in compression functions"""
+        for name, func in inspect.getmembers(compression,
+                                             inspect.isfunction):
+            if func.__module__ == compression.__name__:
+                self.assertTrue(func.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestCompression(unittest.TestCase):
+    """Test the compressed responses of the API"""
+    def setUp(self):
+        """Saves enough states to be compressed and builds a test client"""
+        self.client = app.test_client()
+        self.states = [State(name="State {}".format(i)) for i in range(10)]
+        for state in self.states:
+            storage.new(state)
+        storage.save()
+
+    def tearDown(self):
+        """Deletes the states"""
+        for state in self.states:
+            storage.delete(storage.get(State, state.id))
+        storage.save()
+        storage.close()
+
+    def test_gzip(self):
+        """Test that a gzip response decodes to the plain body"""
+        plain = self.client.get("/api/v1/states")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        response = self.client.get("/api/v1/states",
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    def test_headers(self):
+        """Test that Vary is set and the ETag weakened when compressed"""
+        plain = self.client.get("/api/v1/states")
+        self.assertIn("Accept-Encoding", plain.headers["Vary"])
+        etag, weak = plain.get_etag()
+        self.assertFalse(weak)
+        response = self.client.get("/api/v1/states",
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(response.get_etag(), (etag, True))
+        response = self.client.get("/api/v1/states",
+                                   headers={"Accept-Encoding": "gzip",
+                                            "If-None-Match":
+                                            response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_stream(self):
+        """Test that a gzip streamed response decodes to the plain one"""
+        plain = self.client.get("/api/v1/states?stream=1")
+        response = self.client.get("/api/v1/states?stream=1",
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    def test_small(self):
+        """Test that bodies under the minimum size are sent as is"""
+        response = self.client.get("/api/v1/status",
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.json, {"status": "OK"})
+
+    def test_identity(self):
+        """Test that nothing is compressed unless gzip is accepted"""
+        response = self.client.get("/api/v1/states",
+                                   headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(len(response.json), len(storage.all(State)))
+
+
+if __name__ == "__main__":
+    unittest.main()
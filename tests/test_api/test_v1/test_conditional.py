@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from api.v1 import conditional
+from api.v1.app import app
+import inspect
+from models import storage
+from models.state import State
+import pep8
+import unittest
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional.py"""
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_conditional(self):
+        """Test tests/test_api/test_v1/test_conditional.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_module_docstring(self):
+        """Test for the conditional.py module docstring"""
+        self.assertIsNot(conditional.__doc__, None,
+                         "conditional.py needs a docstring")
+        self.assertTrue(len(conditional.__doc__) >= 1,
+                        "conditional.py needs a docstring")
+
+    def test_conditional_func_docstrings(self):
+        """Test for the presence of docstrings in conditional functions"""
+        for name, func in inspect.getmembers(conditional, inspect.isfunction):
+            if func.__module__ == conditional.__name__:
+                self.assertTrue(func.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestConditional(unittest.TestCase):
+    """Test the conditional GET requests of the API"""
+    def setUp(self):
+        """Saves two states and builds a test client"""
+        self.client = app.test_client()
+        self.states = [State(name="Oregon"), State(name="Utah")]
+        for state in self.states:
+            state.save()
+
+    def tearDown(self):
+        """Deletes the states left"""
+        for state in self.states:
+            if storage.get(State, state.id) is not None:
+                storage.delete(storage.get(State, state.id))
+        storage.save()
+        storage.close()
+
+    def test_etag(self):
+        """Test that a list sent back with its ETag is not modified"""
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_last_modified(self):
+        """Test that only single objects honor If-Modified-Since"""
+        url = "/api/v1/states/" + self.states[0].id
+        response = self.client.get(url)
+        last_modified = response.headers["Last-Modified"]
+        response = self.client.get(
+            url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get("/api/v1/states")
+        self.assertNotIn("Last-Modified", response.headers)
+        response = self.client.get(
+            "/api/v1/states", headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalidation(self):
+        """Test that creating or deleting an object changes the ETag"""
+        etag = self.client.get("/api/v1/states").headers["ETag"]
+        response = self.client.post("/api/v1/states",
+                                    json={"name": "Nevada"})
+        self.states.append(storage.get(State, response.json["id"]))
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Nevada", [state["name"] for state in response.json])
+        etag = response.headers["ETag"]
+        self.client.delete("/api/v1/states/" + self.states[0].id)
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.states[0].id,
+                         [state["id"] for state in response.json])
+
+
+if __name__ == "__main__":
+    unittest.main()
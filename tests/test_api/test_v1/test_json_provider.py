@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonProviderDocs and TestJsonProvider classes
+"""
+
+from api.v1 import json_provider
+from datetime import datetime
+from flask import Flask
+import inspect
+from models.base_model import to_dicts
+from models.state import State
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestJsonProviderDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_provider.py"""
+    def test_pep8_conformance_json_provider(self):
+        """Test that api/v1/json_provider.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/json_provider.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_json_provider(self):
+        """Test tests/test_api/test_v1/test_json_provider.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_json_provider.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_provider_module_docstring(self):
+        """Test for the json_provider.py module docstring"""
+        self.assertIsNot(json_provider.__doc__, None,
+                         "json_provider.py needs a docstring")
+        self.assertTrue(len(json_provider.__doc__) >= 1,
+                        "json_provider.py needs a docstring")
+
+    def test_json_provider_docstrings(self):
+        """Test for the presence of docstrings in json_provider"""
+        for name, obj in inspect.getmembers(json_provider):
+            if getattr(obj, "__module__", None) == json_provider.__name__:
+                self.assertTrue(obj.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestJsonProvider(unittest.TestCase):
+    """Test that the JSON providers give the same output"""
+    def setUp(self):
+        """Builds an app and the objects to serialize"""
+        self.app = Flask(__name__)
+        state = State(name="Zürich ☃ 😀")
+        state.created_at = datetime(2020, 1, 2, 3, 4, 5, 6)
+        self.obj = {"results": to_dicts([state]), "next": None,
+                    "at": datetime(2021, 6, 7, 8, 9, 10, 11),
+                    "note": "naïve ©"}
+
+    def provider(self, name):
+        """returns the provider of the app named name"""
+        with mock.patch.dict(os.environ, {"HBNB_API_JSON": name}):
+            return json_provider.json_provider(self.app)
+
+    def names(self):
+        """returns the names of the providers installed"""
+        return [name for name, provider in json_provider.providers.items()
+                if provider is not None]
+
+    def test_same_response(self):
+        """Test that every provider gives the body of the stdlib one"""
+        with self.app.app_context():
+            expected = self.provider("json").response(self.obj).get_data()
+            self.assertIn("Zürich ☃ 😀".encode(), expected)
+            self.assertIn(b'"2020-01-02T03:04:05.000006"', expected)
+            self.assertIn(b'"Mon, 07 Jun 2021 08:09:10 GMT"', expected)
+            for name in self.names():
+                with self.subTest(provider=name):
+                    response = self.provider(name).response(self.obj)
+                    self.assertEqual(response.get_data(), expected)
+
+    def test_same_dumps(self):
+        """Test that every provider dumps the same values"""
+        expected = self.provider("json").dumps(self.obj)
+        self.assertIn("Zürich ☃ 😀", expected)
+        for name in self.names():
+            with self.subTest(provider=name):
+                provider = self.provider(name)
+                dumped = provider.dumps(self.obj)
+                self.assertIn("Zürich ☃ 😀", dumped)
+                self.assertEqual(provider.loads(dumped),
+                                 provider.loads(expected))
+
+    def test_unknown(self):
+        """Test that a provider not installed is refused"""
+        with self.assertRaises(ValueError):
+            self.provider("simplejson")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1 import pagination
+from api.v1.app import app
+from base64 import urlsafe_b64encode
+from datetime import datetime
+import inspect
+from models import storage
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination.py"""
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_api/test_v1/test_pagination.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for name, func in inspect.getmembers(pagination, inspect.isfunction):
+            if func.__module__ == pagination.__name__:
+                self.assertTrue(func.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestPagination(unittest.TestCase):
+    """Test the keyset pagination of the list endpoints"""
+    def setUp(self):
+        """Saves a state with five cities created at the same time"""
+        self.client = app.test_client()
+        self.state = State(name="Texas")
+        created_at = datetime(2020, 1, 2, 3, 4, 5, 6)
+        self.cities = [City(name="City {}".format(i),
+                            state_id=self.state.id) for i in range(5)]
+        for city in self.cities:
+            city.created_at = created_at
+        storage.new(self.state)
+        storage.save()
+        for city in self.cities:
+            storage.new(city)
+        storage.save()
+        self.url = "/api/v1/states/{}/cities".format(self.state.id)
+
+    def tearDown(self):
+        """Deletes the state and its cities"""
+        for city in self.cities:
+            storage.delete(storage.get(City, city.id))
+        storage.save()
+        storage.delete(storage.get(State, self.state.id))
+        storage.save()
+        storage.close()
+
+    def test_walk(self):
+        """Test that walking the pages of objects created at the same time
+        returns each of them once, by id"""
+        ids = []
+        pages = 0
+        cursor = None
+        while True:
+            url = self.url + "?limit=2"
+            if cursor:
+                url += "&after=" + cursor
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json["results"]), 2)
+            ids += [city["id"] for city in response.json["results"]]
+            pages += 1
+            cursor = response.json["next"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, sorted(city.id for city in self.cities))
+
+    def test_last_page(self):
+        """Test that a limit covering every object gives no next cursor"""
+        response = self.client.get(self.url + "?limit=5")
+        self.assertEqual(len(response.json["results"]), 5)
+        self.assertIsNone(response.json["next"])
+
+    def test_bad_cursor(self):
+        """Test that garbled after cursors are refused"""
+        cursors = ["garbage", "!!!", "é",
+                   urlsafe_b64encode(b"no separator").decode(),
+                   urlsafe_b64encode(b"not a date|id").decode(),
+                   urlsafe_b64encode(b"\xff\xfe|id").decode()]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, query_string={
+                    "limit": 2, "after": cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_bad_limit(self):
+        """Test that limits that are not positive integers are refused"""
+        for limit in ("0", "-1", "two", ""):
+            with self.subTest(limit=limit):
+                response = self.client.get(self.url, query_string={
+                    "limit": limit})
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
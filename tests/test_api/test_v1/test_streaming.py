@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+from api.v1 import streaming
+from api.v1.app import app
+import inspect
+from models import storage
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming.py"""
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_streaming(self):
+        """Test tests/test_api/test_v1/test_streaming.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/\
+test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_module_docstring(self):
+        """Test for the streaming.py module docstring"""
+        self.assertIsNot(streaming.__doc__, None,
+                         "streaming.py needs a docstring")
+        self.assertTrue(len(streaming.__doc__) >= 1,
+                        "streaming.py needs a docstring")
+
+    def test_streaming_func_docstrings(self):
+        """Test for the presence of docstrings in streaming functions"""
+        for name, func in inspect.getmembers(streaming, inspect.isfunction):
+            if func.__module__ == streaming.__name__:
+                self.assertTrue(func.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the streamed list responses of the API"""
+    def setUp(self):
+        """Saves five states and builds a test client"""
+        self.client = app.test_client()
+        self.states = [State(name="State {}".format(i)) for i in range(5)]
+        for state in self.states:
+            storage.new(state)
+        storage.save()
+
+    def tearDown(self):
+        """Deletes the states"""
+        for state in self.states:
+            storage.delete(storage.get(State, state.id))
+        storage.save()
+        storage.close()
+
+    def test_stream(self):
+        """Test that a streamed list is the JSON array of the plain one"""
+        expected = self.client.get("/api/v1/states").json
+        with mock.patch("api.v1.streaming.chunk_size", 2), \
+                mock.patch("api.v1.pagination.chunk_size", 2):
+            response = self.client.get("/api/v1/states?stream=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertNotIn("ETag", response.headers)
+        self.assertEqual(sorted(response.json, key=lambda d: d["id"]),
+                         sorted(expected, key=lambda d: d["id"]))
+
+    def test_stream_empty(self):
+        """Test that streaming no objects gives an empty array"""
+        response = self.client.get("/api/v1/states/{}/cities?stream=1"
+                                   .format(self.states[0].id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [])
+
+    def test_stream_limit(self):
+        """Test that stream is ignored when the list is paged"""
+        response = self.client.get("/api/v1/states?stream=1&limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Content-Length", response.headers)
+        self.assertIn("ETag", response.headers)
+        self.assertEqual(len(response.json["results"]), 2)
+        self.assertIsNotNone(response.json["next"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -138,6 +138,38 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dicts(self):
+        """Test that to_dicts formats the datetimes as strftime(time) and
+        leaves out the password unless asked not to"""
+        t_format = models.base_model.time
+        insts = [BaseModel(), BaseModel(name="Holberton")]
+        insts[0].created_at = datetime(2020, 1, 2, 3, 4, 5)
+        insts[1].password = "pwd"
+        dicts = models.base_model.to_dicts(insts)
+        self.assertEqual(dicts[0], {
+            "__class__": "BaseModel", "id": insts[0].id,
+            "created_at": "2020-01-02T03:04:05.000000",
+            "updated_at": insts[0].updated_at.strftime(t_format)})
+        self.assertEqual(dicts[1], {
+            "__class__": "BaseModel", "id": insts[1].id,
+            "name": "Holberton",
+            "created_at": insts[1].created_at.strftime(t_format),
+            "updated_at": insts[1].updated_at.strftime(t_format)})
+        dicts = models.base_model.to_dicts(insts, False)
+        self.assertEqual(dicts[1]["password"], "pwd")
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_to_dicts_relationships(self):
+        """Test that to_dicts leaves out the SQLAlchemy state and the
+        loaded relationships"""
+        state = models.state.State(name="Ohio")
+        state.cities = []
+        self.assertIn("cities", state.__dict__)
+        self.assertIn("_sa_instance_state", state.__dict__)
+        self.assertCountEqual(models.base_model.to_dicts([state])[0],
+                              ["__class__", "id", "name", "created_at",
+                               "updated_at"])
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -159,6 +191,21 @@ class TestBaseModel(unittest.TestCase):
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_dirty(self):
+        """Test that changes after a save are reported to storage"""
+        inst = BaseModel()
+        self.assertTrue(inst._dirty)
+        inst.save()
+        self.assertFalse(inst._dirty)
+        self.assertNotIn(inst, models.storage.dirty().values())
+        inst.name = "Holberton"
+        self.assertTrue(inst._dirty)
+        self.assertNotIn("_dirty", inst.to_dict())
+        self.assertIn(inst, models.storage.dirty().values())
+        models.storage.delete(inst)
+        models.storage.save()
+
 
 if __name__ == "__main__":
     unittest.main()
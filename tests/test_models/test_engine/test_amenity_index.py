@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestAmenityIndexDocs and TestAmenityIndex classes
+"""
+
+import inspect
+from models.engine import amenity_index
+import pep8
+import unittest
+AmenityIndex = amenity_index.AmenityIndex
+
+
+class TestAmenityIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of AmenityIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ai_f = inspect.getmembers(AmenityIndex, inspect.isfunction)
+
+    def test_pep8_conformance_amenity_index(self):
+        """Test that models/engine/amenity_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/amenity_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_amenity_index(self):
+        """Test tests/test_models/test_amenity_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_amenity_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_amenity_index_module_docstring(self):
+        """Test for the amenity_index.py module docstring"""
+        self.assertIsNot(amenity_index.__doc__, None,
+                         "amenity_index.py needs a docstring")
+        self.assertTrue(len(amenity_index.__doc__) >= 1,
+                        "amenity_index.py needs a docstring")
+
+    def test_amenity_index_class_docstring(self):
+        """Test for the AmenityIndex class docstring"""
+        self.assertIsNot(AmenityIndex.__doc__, None,
+                         "AmenityIndex class needs a docstring")
+        self.assertTrue(len(AmenityIndex.__doc__) >= 1,
+                        "AmenityIndex class needs a docstring")
+
+    def test_ai_func_docstrings(self):
+        """Test for the presence of docstrings in AmenityIndex methods"""
+        for func in self.ai_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestAmenityIndex(unittest.TestCase):
+    """Test the AmenityIndex class"""
+    def setUp(self):
+        """Builds an index of three places"""
+        self.index = AmenityIndex([("loft", "wifi"), ("loft", "pool"),
+                                   ("barn", "wifi"), ("tent", "parking")])
+
+    def test_all_of(self):
+        """Test that all_of returns the places having every amenity"""
+        self.assertCountEqual(self.index.all_of(["wifi"]), ["loft", "barn"])
+        self.assertEqual(self.index.all_of(["wifi", "pool"]), ["loft"])
+        self.assertEqual(self.index.all_of(["wifi", "parking"]), [])
+        self.assertEqual(self.index.all_of(["wifi", "nope"]), [])
+        self.assertEqual(self.index.all_of([]), [])
+
+    def test_any_of(self):
+        """Test that any_of returns the places having an amenity"""
+        self.assertCountEqual(self.index.any_of(["pool", "parking"]),
+                              ["loft", "tent"])
+        self.assertEqual(self.index.any_of([]), [])
+
+    def test_remove(self):
+        """Test that removed places and amenities are forgotten"""
+        self.index.remove("loft", "pool")
+        self.assertEqual(self.index.all_of(["pool"]), [])
+        self.index.remove("barn")
+        self.assertEqual(self.index.all_of(["wifi"]), ["loft"])
+        self.index.remove_amenity("wifi")
+        self.assertEqual(self.index.any_of(["wifi", "pool"]), [])
+        self.index.add("cabin", "pool")
+        self.assertEqual(self.index.all_of(["pool"]), ["cabin"])
+
+    def test_set(self):
+        """Test that set replaces the amenities of a place"""
+        self.index.set("loft", ["parking"])
+        self.assertEqual(self.index.all_of(["pool"]), [])
+        self.assertCountEqual(self.index.all_of(["parking"]),
+                              ["loft", "tent"])
+
+
+if __name__ == "__main__":
+    unittest.main()
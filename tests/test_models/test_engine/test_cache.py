@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestLRUCacheDocs and TestLRUCache classes
+"""
+
+import inspect
+from models.engine import cache
+import pep8
+import unittest
+from unittest import mock
+LRUCache = cache.LRUCache
+
+
+class TestLRUCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of LRUCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(LRUCache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that models/engine/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_models/test_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_lru_cache_class_docstring(self):
+        """Test for the LRUCache class docstring"""
+        self.assertIsNot(LRUCache.__doc__, None,
+                         "LRUCache class needs a docstring")
+        self.assertTrue(len(LRUCache.__doc__) >= 1,
+                        "LRUCache class needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in LRUCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRUCache class"""
+    def setUp(self):
+        """Builds a cache of two values"""
+        self.cache = LRUCache(maxsize=2, ttl=10)
+
+    def test_lru(self):
+        """Test that the least recently used value is evicted"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.set("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.set("c", 4)
+        self.assertEqual(self.cache.get("c"), 4)
+        self.assertEqual(self.cache.get("missing", 0), 0)
+
+    def test_ttl(self):
+        """Test that values expire after ttl seconds"""
+        with mock.patch.object(cache, "monotonic", return_value=100):
+            self.cache.set("a", 1)
+        with mock.patch.object(cache, "monotonic", return_value=109):
+            self.assertEqual(self.cache.get("a"), 1)
+        with mock.patch.object(cache, "monotonic", return_value=110):
+            self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate(self):
+        """Test that invalidate drops the values of a tag only"""
+        self.cache.set("a", 1, ("State",))
+        self.cache.set("b", 2, ("City", "State"))
+        self.cache.invalidate("City")
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.cache.invalidate("State")
+        self.assertEqual(len(self.cache), 0)
+        self.cache.set("a", 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stats(self):
+        """Test that stats counts hits, misses, evictions and expirations"""
+        with mock.patch.object(cache, "monotonic", return_value=0):
+            self.cache.set("a", 1)
+            self.cache.set("b", 2)
+            self.cache.set("c", 3)
+            self.cache.get("c")
+            self.cache.get("a")
+        with mock.patch.object(cache, "monotonic", return_value=20):
+            self.cache.get("b")
+        self.assertEqual(self.cache.stats(),
+                         {"size": 1, "maxsize": 2, "ttl": 10, "hits": 1,
+                          "misses": 2, "evictions": 1, "expirations": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
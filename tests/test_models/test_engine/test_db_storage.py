@@ -17,7 +17,10 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import create_engine, event
+import threading
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -107,6 +110,435 @@ class TestDBStorage(unittest.TestCase):
         new_count = models.storage.count(State)
         self.assertEqual(new_count, initial_count + 1)
 
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_live(self):
+        """Test that counts follow commits and ignore rollbacks"""
+        initial_count = models.storage.count("State")
+        total = models.storage.count()
+        state = State(name="Iowa")
+        state.save()
+        self.assertEqual(models.storage.count(State), initial_count + 1)
+        self.assertEqual(models.storage.count(), total + 1)
+        with self.assertRaises(ValueError):
+            with models.storage.batch():
+                State(name="Utah").save()
+                models.storage.all(State)
+                raise ValueError
+        self.assertEqual(models.storage.count(State), initial_count + 1)
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertEqual(models.storage.count(State), initial_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_flushed(self):
+        """Test that rows flushed when counts are read are counted once"""
+        storage = models.storage
+        initial_count = storage.count(State)
+        with storage.batch():
+            state = State(name="Utah")
+            state.save()
+            storage.all(State)
+            with mock.patch.object(storage, "_DBStorage__count_refresh", -1):
+                self.assertEqual(storage.count(State), initial_count)
+        self.assertEqual(storage.count(State), initial_count + 1)
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(storage.count(State), initial_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_unknown(self):
+        """Test that classes not stored count 0"""
+        self.assertEqual(models.storage.count(BaseModel), 0)
+        self.assertEqual(models.storage.count("Unknown"), 0)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iterate(self):
+        """Test that iterate yields the objects matching the filters"""
+        storage = models.storage
+        state = State(name="Idaho")
+        cities = [City(name=name, state_id=state.id)
+                  for name in ("Boise", "Nampa", "Eagle")]
+        storage.new(state)
+        storage.save()
+        storage.bulk_save(cities)
+        found = storage.iterate(City, order_by="name", chunk_size=2,
+                                state_id=state.id)
+        self.assertNotIsInstance(found, (list, dict))
+        self.assertEqual([city.name for city in found],
+                         ["Boise", "Eagle", "Nampa"])
+        found = storage.iterate("State", id=state.id)
+        self.assertEqual([obj.id for obj in found], [state.id])
+        places = storage.search_places(cities=[cities[0].id], chunk_size=2)
+        self.assertEqual(list(places), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_events(self):
+        """Test that saved creations, updates and deletions are emitted"""
+        storage = models.storage
+        received = []
+        batches = []
+        storage.events.subscribe(received.append, State)
+        storage.events.subscribe(batches.append, mode="batch")
+        try:
+            state = State(name="Maine")
+            storage.new(state)
+            self.assertEqual(received, [])
+            storage.save()
+            state.name = "Vermont"
+            storage.save()
+            storage.delete(state)
+            storage.save()
+        finally:
+            storage.events.unsubscribe(received.append)
+            storage.events.unsubscribe(batches.append)
+        self.assertEqual([(event.type, event.key, event.obj)
+                          for event in received],
+                         [(type, "State." + state.id, state)
+                          for type in ("create", "update", "delete")])
+        self.assertEqual(len(batches), 3)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version(self):
+        """Test that commits changing a class bump its version"""
+        storage = models.storage
+        state_version = storage.version(State)
+        version = storage.version()
+        state = State(name="Maine")
+        storage.new(state)
+        storage.all(State)
+        self.assertEqual(storage.version("State"), state_version)
+        storage.save()
+        self.assertGreater(storage.version(State), state_version)
+        self.assertGreater(storage.version(), version)
+        city_version = storage.version(City)
+        state_version = storage.version(State)
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                state.name = "Vermont"
+                storage.save()
+                storage.all(State)
+                raise ValueError
+        self.assertEqual(storage.version(State), state_version)
+        storage.delete(state)
+        storage.save()
+        self.assertGreater(storage.version(State), state_version)
+        self.assertEqual(storage.version(City), city_version)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_filters(self):
+        """Test that all filters, orders and limits the rows in SQL"""
+        state = State(name="Ohio")
+        cities = [City(name=name, state_id=state.id)
+                  for name in ["Dayton", "Akron", "Canton"]]
+        models.storage.bulk_new([state] + cities)
+        models.storage.save()
+        found = models.storage.all(City, state_id=state.id, order_by="name")
+        self.assertEqual(list(found.values()),
+                         [cities[1], cities[2], cities[0]])
+        found = models.storage.all(City, state_id=state.id,
+                                   order_by="-name", limit=2)
+        self.assertEqual(list(found.values()), [cities[0], cities[2]])
+        found = models.storage.all(City, state_id=state.id, name="Akron")
+        self.assertEqual(found, {"City." + cities[1].id: cities[1]})
+        self.assertEqual(len(models.storage.all(state_id=state.id)), 3)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_after(self):
+        """Test that all only fetches rows sorting after a cursor"""
+        state = State(name="Ohio")
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        models.storage.bulk_new([state] + cities)
+        models.storage.save()
+        order = ("created_at", "id")
+        cities.sort(key=lambda city: (city.created_at, city.id))
+        page = models.storage.all(City, state_id=state.id, order_by=order,
+                                  limit=2, after=(cities[1].created_at,
+                                                  cities[1].id))
+        self.assertEqual(list(page.values()), cities[2:4])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """Test that search_places intersects states, cities and amenities"""
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="Ohio")
+        other = State(name="Utah")
+        akron = City(name="Akron", state_id=state.id)
+        dayton = City(name="Dayton", state_id=other.id)
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = Place(name="Loft", city_id=akron.id, user_id=user.id)
+        barn = Place(name="Barn", city_id=dayton.id, user_id=user.id)
+        loft.amenities.append(wifi)
+        barn.amenities.extend([wifi, pool])
+        models.storage.bulk_new([user, state, other, akron, dayton, wifi,
+                                 pool, loft, barn])
+        models.storage.save()
+        found = models.storage.search_places(states=[state.id])
+        self.assertEqual(list(found.values()), [loft])
+        found = models.storage.search_places(states=[state.id],
+                                             cities=[dayton.id])
+        self.assertEqual(list(found.values()), [loft, barn])
+        found = models.storage.search_places(amenities=[wifi.id, pool.id])
+        self.assertEqual(list(found.values()), [barn])
+        found = models.storage.search_places(cities=[akron.id],
+                                             amenities=[pool.id])
+        self.assertEqual(found, {})
+        found = models.storage.places_with_amenities([wifi.id])
+        self.assertCountEqual(found.values(), [loft, barn])
+        models.storage.unlink_amenity(barn, wifi)
+        models.storage.save()
+        found = models.storage.places_with_amenities([wifi.id, pool.id],
+                                                     "any")
+        self.assertCountEqual(found.values(), [loft, barn])
+        found = models.storage.places_with_amenities([wifi.id])
+        self.assertEqual(list(found.values()), [loft])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_amenity_index(self):
+        """Test that the amenity index only follows committed links"""
+        storage = models.storage
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="Ohio")
+        city = City(name="Akron", state_id=state.id)
+        wifi = Amenity(name="Wifi")
+        loft = Place(name="Loft", city_id=city.id, user_id=user.id)
+        wifi_id, loft_id = wifi.id, loft.id
+        storage.bulk_new([user, state, city, wifi, loft])
+        storage.save()
+        self.assertEqual(storage.places_with_amenities([wifi_id]), {})
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                storage.link_amenity(loft, wifi)
+                storage.save()
+                storage.all(Place)
+                self.assertEqual(storage.places_with_amenities([wifi_id]),
+                                 {})
+                raise ValueError
+        self.assertEqual(storage.places_with_amenities([wifi_id]), {})
+        storage.close()
+        loft = storage.get(Place, loft_id)
+        loft.amenities.append(storage.get(Amenity, wifi_id))
+        storage.save()
+        self.assertEqual(list(storage.places_with_amenities([wifi_id])),
+                         ["Place." + loft_id])
+        place_amenity = models.base_model.Base.metadata.tables[
+            "place_amenity"]
+        engine = create_engine(os.getenv("HBNB_DB_URL"))
+        with engine.begin() as connection:
+            connection.execute(place_amenity.delete().where(
+                place_amenity.c.place_id == loft_id))
+        engine.dispose()
+        self.assertEqual(list(storage.places_with_amenities([wifi_id])),
+                         ["Place." + loft_id])
+        with mock.patch.object(storage, "_DBStorage__index_refresh", 0):
+            self.assertEqual(storage.places_with_amenities([wifi_id]), {})
+        storage.close()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_save(self):
+        """Test that bulk_save inserts all objects at once"""
+        initial_count = models.storage.count(State)
+        states = [State(name="State{}".format(i)) for i in range(5)]
+        models.storage.bulk_save(iter(states), chunk_size=2)
+        self.assertEqual(models.storage.count(State), initial_count + 5)
+        self.assertEqual(models.storage.get(State, states[0].id).name,
+                         "State0")
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_batch(self):
+        """Test that batch defers the commit until the end of the block"""
+        with models.storage.batch():
+            state = State(name="Nevada")
+            state.save()
+            self.assertIn(state, models.storage.dirty().values())
+        self.assertEqual(models.storage.dirty(), {})
+        self.assertEqual(models.storage.get(State, state.id), state)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_batch_threads(self):
+        """Test that batch only defers the saves of its own thread"""
+        storage = models.storage
+        entered = threading.Event()
+        done = threading.Event()
+
+        def batched():
+            """waits in a batch block until done is set"""
+            with storage.batch():
+                entered.set()
+                done.wait(10)
+        thread = threading.Thread(target=batched)
+        thread.start()
+        try:
+            self.assertTrue(entered.wait(10))
+            state = State(name="Nevada")
+            storage.new(state)
+            storage.save()
+            self.assertEqual(storage.dirty(), {})
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "Nevada")
+        finally:
+            done.set()
+            thread.join()
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_load(self):
+        """Test that load eager loads relationships"""
+        state = State(name="Ohio")
+        city = City(name="Akron", state_id=state.id)
+        models.storage.bulk_new([state, city])
+        models.storage.save()
+        models.storage.close()
+        found = models.storage.all(State, load="cities")["State." + state.id]
+        self.assertIn("cities", found.__dict__)
+        self.assertEqual([obj.id for obj in found.cities], [city.id])
+        self.assertNotIn("cities", found.to_dict())
+        models.storage.close()
+        found = models.storage.get(State, state.id,
+                                   load={"cities.places": "joined"})
+        self.assertIn("cities", found.__dict__)
+        self.assertIn("places", found.cities[0].__dict__)
+        models.storage.close()
+        with self.assertRaises(ValueError):
+            models.storage.get(State, state.id, load="name")
+        with self.assertRaises(ValueError):
+            models.storage.all(State, load={"cities": "eager"})
+
+
+class TestDBStorageEngine(unittest.TestCase):
+    """Test the engine and connection pool settings of DBStorage"""
+    def test_pool_options(self):
+        """Test that pool settings are read from the environment"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "10",
+               "HBNB_MYSQL_POOL_PRE_PING": "true",
+               "HBNB_MYSQL_POOL_TIMEOUT": "2.5"}
+        with mock.patch.dict(os.environ, env):
+            options = db_storage.pool_options({"pool_recycle": 3600})
+        self.assertEqual(options, {"pool_size": 10, "pool_pre_ping": True,
+                                   "pool_timeout": 2.5,
+                                   "pool_recycle": 3600})
+
+    def test_timed_queue_pool(self):
+        """Test that TimedQueuePool counts and times checkouts"""
+        engine = create_engine("sqlite://", pool_size=1, max_overflow=0,
+                               poolclass=db_storage.TimedQueuePool)
+        pool = engine.pool
+        with engine.connect():
+            self.assertEqual(pool.checkedout(), 1)
+        self.assertEqual(pool.checkedout(), 0)
+        self.assertEqual(pool.checkouts, 1)
+        self.assertGreaterEqual(pool.wait_time, 0)
+        engine.dispose()
+
+    def test_make_engine_sqlite(self):
+        """Test that SQLite engines get WAL mode and the pragmas"""
+        path = "test_make_engine.db"
+        engine = db_storage.make_engine("sqlite:///" + path,
+                                        {"pool_size": 2})
+        try:
+            self.assertIsInstance(engine.pool, db_storage.TimedQueuePool)
+            with engine.connect() as conn:
+                pragma = conn.exec_driver_sql("PRAGMA journal_mode")
+                self.assertEqual(pragma.scalar(), "wal")
+                pragma = conn.exec_driver_sql("PRAGMA foreign_keys")
+                self.assertEqual(pragma.scalar(), 1)
+        finally:
+            engine.dispose()
+            for suffix in ["", "-wal", "-shm"]:
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        engine = db_storage.make_engine("sqlite://")
+        self.assertEqual(engine.pool.__class__.__name__, "StaticPool")
+        engine.dispose()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_replica_routing(self):
+        """Test that reads go to a replica until the session writes"""
+        paths = ["test_primary.db", "test_replica.db"]
+        urls = ["sqlite:///" + path for path in paths]
+        try:
+            with mock.patch.dict(os.environ, {"HBNB_ENV": ""}):
+                os.environ["HBNB_DB_URL"] = urls[1]
+                replica = DBStorage()
+                os.environ["HBNB_DB_URL"] = urls[0]
+                storage = DBStorage(replicas=urls[1:], policy="least_loaded")
+            replica.reload()
+            storage.reload()
+            on_replica = State(name="California")
+            user = User(email="a@b.c", password="pwd")
+            city = City(name="Fresno", state_id=on_replica.id)
+            wifi = Amenity(name="Wifi")
+            place = Place(name="Loft", city_id=city.id, user_id=user.id)
+            place.amenities.append(wifi)
+            replica.bulk_new([on_replica, user, city, wifi, place])
+            replica.save()
+            replica.close()
+            on_primary = State(name="Nevada")
+            storage.new(on_primary)
+            storage.save()
+            storage.close()
+            self.assertEqual(storage.count(State), 1)
+            self.assertEqual(list(storage.places_with_amenities([wifi.id])),
+                             ["Place." + place.id])
+            self.assertEqual(list(storage.all(State)),
+                             ["State." + on_replica.id])
+            self.assertIn("replicas", storage.pool_stats())
+            storage.mark_dirty(on_replica, "name")
+            self.assertEqual(list(storage.all(State)),
+                             ["State." + on_primary.id])
+            storage.close()
+            self.assertEqual(list(storage.all(State)),
+                             ["State." + on_replica.id])
+            storage.close()
+        finally:
+            for path in paths:
+                for suffix in ["", "-wal", "-shm"]:
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_cache(self):
+        """Test that get and all are cached until their class changes"""
+        path = "test_cache.db"
+        try:
+            with mock.patch.dict(os.environ, {"HBNB_ENV": "",
+                                              "HBNB_DB_URL": "sqlite:///" +
+                                              path}):
+                storage = DBStorage(cache_size=2, cache_ttl=60)
+            storage.reload()
+            queries = []
+            event.listen(storage._DBStorage__engine, "before_cursor_execute",
+                         lambda *args: queries.append(args[2]))
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).id, state.id)
+            self.assertEqual(list(storage.all(State)), ["State." + state.id])
+            storage.close()
+            del queries[:]
+            self.assertEqual(storage.get(State, state.id).name, "California")
+            self.assertEqual(list(storage.all(State)), ["State." + state.id])
+            self.assertEqual(queries, [])
+            self.assertEqual(storage.cache_stats()["hits"], 2)
+            storage.close()
+            storage.get(State, state.id).name = "Nevada"
+            storage.save()
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "Nevada")
+            self.assertNotEqual(queries, [])
+            storage.close()
+            storage.all(City)
+            storage.all(Amenity)
+            self.assertEqual(storage.cache_stats()["size"], 2)
+            self.assertEqual(storage.cache_stats()["evictions"], 1)
+            storage.close()
+        finally:
+            for suffix in ["", "-wal", "-shm"]:
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the TestEventBusDocs and TestEventBus classes
+"""
+
+import inspect
+from models.engine import events
+from models.state import State
+import pep8
+import threading
+import unittest
+EventBus = events.EventBus
+
+
+class TestEventBusDocs(unittest.TestCase):
+    """Tests to check the documentation and style of EventBus class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.bus_f = inspect.getmembers(EventBus, inspect.isfunction)
+
+    def test_pep8_conformance_events(self):
+        """Test that models/engine/events.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/events.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_events(self):
+        """Test tests/test_models/test_events.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_events.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_events_module_docstring(self):
+        """Test for the events.py module docstring"""
+        self.assertIsNot(events.__doc__, None,
+                         "events.py needs a docstring")
+        self.assertTrue(len(events.__doc__) >= 1,
+                        "events.py needs a docstring")
+
+    def test_event_bus_class_docstring(self):
+        """Test for the EventBus class docstring"""
+        self.assertIsNot(EventBus.__doc__, None,
+                         "EventBus class needs a docstring")
+        self.assertTrue(len(EventBus.__doc__) >= 1,
+                        "EventBus class needs a docstring")
+
+    def test_bus_func_docstrings(self):
+        """Test for the presence of docstrings in EventBus methods"""
+        for func in self.bus_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestEventBus(unittest.TestCase):
+    """Test the EventBus class"""
+    def setUp(self):
+        """Builds a bus and a State"""
+        self.bus = EventBus()
+        self.state = State(name="Maine")
+
+    def test_sync(self):
+        """Test that sync subscribers get the events of their filters"""
+        received = []
+        self.bus.subscribe(received.append)
+        self.bus.subscribe(received.append, State, "delete")
+        self.bus.subscribe(received.append, "City")
+        self.bus.emit("create", self.state)
+        self.bus.emit("delete", key="State.1")
+        key = "State." + self.state.id
+        self.assertEqual(received, [
+            events.Event("create", "State", key, self.state),
+            events.Event("delete", "State", "State.1", None),
+            events.Event("delete", "State", "State.1", None)])
+        self.bus.unsubscribe(received.append)
+        self.bus.emit("update", name="State")
+        self.assertEqual(len(received), 3)
+
+    def test_batch(self):
+        """Test that batch subscribers get the events at flush"""
+        received = []
+        self.bus.subscribe(received.append, mode="batch")
+        self.bus.emit("create", self.state)
+        self.bus.emit("update", self.state)
+        self.assertEqual(received, [])
+        self.bus.flush()
+        self.assertEqual([[event.type for event in batch]
+                          for batch in received], [["create", "update"]])
+        self.bus.emit("delete", self.state)
+        self.bus.discard()
+        self.bus.flush()
+        self.assertEqual(len(received), 1)
+
+    def test_async(self):
+        """Test that async subscribers get the events in another thread"""
+        threads = []
+        self.bus.subscribe(lambda event:
+                           threads.append(threading.current_thread()),
+                           mode="async")
+        self.bus.emit("create", self.state)
+        self.bus.emit("update", self.state)
+        self.bus.join()
+        self.assertEqual(len(threads), 2)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_version(self):
+        """Test that version counts the events of classes"""
+        self.bus.emit("create", self.state)
+        self.bus.emit("update", name="City")
+        self.assertEqual(self.bus.version(State), 1)
+        self.assertEqual(self.bus.version("State", "City"), 2)
+        self.assertEqual(self.bus.version(), 2)
+        self.assertEqual(self.bus.version("Amenity"), 0)
+
+    def test_errors(self):
+        """Test that unknown modes and event types are refused"""
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(print, mode="later")
+        with self.assertRaises(ValueError):
+            self.bus.subscribe(print, events=["created"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,7 +17,11 @@ from models.user import User
 import json
 import os
 import pep8
+import subprocess
+import sys
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -114,6 +118,209 @@ class TestFileStorage(unittest.TestCase):
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_dirty(self):
+        """Test that save only calls to_dict on changed objects"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        self.assertEqual(storage.dirty(), {})
+        state.name = "Idaho"
+        self.assertEqual(storage.dirty(), {"State." + state.id: state})
+        calls = []
+        to_dict = State.to_dict
+        State.to_dict = lambda self: calls.append(self) or to_dict(self)
+        try:
+            storage.save()
+        finally:
+            State.to_dict = to_dict
+        self.assertEqual(calls, [state])
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Idaho")
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that related follows new, delete and attribute changes"""
+        storage = FileStorage()
+        ohio = State(name="Ohio")
+        utah = State(name="Utah")
+        city = City(name="Akron", state_id=ohio.id)
+        place = Place(name="Loft", city_id=city.id)
+        wifi = Amenity(name="Wifi")
+        for obj in [ohio, utah, city, place, wifi]:
+            storage.new(obj)
+        self.assertEqual(ohio.cities, [city])
+        self.assertEqual(city.places, [place])
+        city.state_id = utah.id
+        self.assertEqual(ohio.cities, [])
+        self.assertEqual(utah.cities, [city])
+        place.amenities = wifi
+        self.assertEqual(place.amenities, [wifi])
+        self.assertEqual(storage.related(Place, "amenity_ids", wifi.id),
+                         {"Place." + place.id: place})
+        storage.delete(city)
+        self.assertEqual(utah.cities, [])
+        for obj in [ohio, utah, place, wifi]:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_save(self):
+        """Test that bulk_save adds and saves all objects at once"""
+        storage = FileStorage()
+        states = [State(name="State{}".format(i)) for i in range(5)]
+        storage.bulk_save(iter(states))
+        self.assertEqual(storage.dirty(), {})
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        for state in states:
+            self.assertIn("State." + state.id, js)
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch(self):
+        """Test that batch defers save until the end of the block"""
+        storage = FileStorage()
+        with storage.batch():
+            state = State(name="Nevada")
+            state.save()
+            self.assertIn(state, storage.dirty().values())
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + state.id, json.load(f))
+        self.assertEqual(storage.dirty(), {})
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+        other = State(name="Utah")
+        other.save()
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                state.name = "Oregon"
+                storage.delete(other)
+                created = State(name="Idaho")
+                created.save()
+                storage.save()
+                raise ValueError
+        self.assertEqual(storage.dirty(), {})
+        self.assertEqual(state.name, "Nevada")
+        self.assertIs(storage.all(State).get("State." + other.id), other)
+        self.assertNotIn("State." + created.id, storage.all(State))
+        iowa = State(name="Iowa")
+        iowa.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["State." + state.id]["name"], "Nevada")
+        self.assertIn("State." + other.id, saved)
+        self.assertNotIn("State." + created.id, saved)
+        with storage.batch():
+            state.name = "Oregon"
+            storage.save()
+            with self.assertRaises(ValueError):
+                with storage.batch():
+                    raise ValueError
+        self.assertEqual(storage.dirty(), {})
+        self.assertEqual(state.name, "Oregon")
+        storage.delete(state)
+        storage.delete(other)
+        storage.delete(iowa)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch_threads(self):
+        """Test that batch only defers the saves of its own thread"""
+        storage = FileStorage()
+        entered = threading.Event()
+        done = threading.Event()
+
+        def batched():
+            """waits in a batch block until done is set"""
+            with storage.batch():
+                entered.set()
+                done.wait(10)
+        thread = threading.Thread(target=batched)
+        thread.start()
+        try:
+            self.assertTrue(entered.wait(10))
+            state = State(name="Nevada")
+            storage.new(state)
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+        finally:
+            done.set()
+            thread.join()
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_filters(self):
+        """Test that all filters, orders and limits the objects"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        cities = [City(name=name, state_id=state.id)
+                  for name in ["Dayton", "Akron", "Canton"]]
+        storage.bulk_new([state] + cities)
+        found = storage.all(City, state_id=state.id, order_by="name")
+        self.assertEqual(list(found.values()),
+                         [cities[1], cities[2], cities[0]])
+        found = storage.all(City, state_id=state.id, order_by="-name",
+                            limit=2)
+        self.assertEqual(list(found.values()), [cities[0], cities[2]])
+        found = storage.all(City, state_id=state.id, name="Akron")
+        self.assertEqual(found, {"City." + cities[1].id: cities[1]})
+        self.assertEqual(storage.all("City", state_id="nope"), {})
+        for obj in [state] + cities:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_after(self):
+        """Test that all only returns objects sorting after a cursor"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        storage.bulk_new([state] + cities)
+        order = ("created_at", "id")
+        cities.sort(key=lambda city: (city.created_at, city.id))
+        page = storage.all(City, state_id=state.id, order_by=order, limit=2,
+                           after=(cities[1].created_at, cities[1].id))
+        self.assertEqual(list(page.values()), cities[2:4])
+        for obj in [state] + cities:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places intersects states, cities and amenities"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        akron = City(name="Akron", state_id=state.id)
+        dayton = City(name="Dayton", state_id="elsewhere")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = Place(name="Loft", city_id=akron.id, amenity_ids=[wifi.id])
+        barn = Place(name="Barn", city_id=dayton.id,
+                     amenity_ids=[wifi.id, pool.id])
+        objs = [state, akron, dayton, wifi, pool, loft, barn]
+        storage.bulk_new(objs)
+        found = storage.search_places(states=[state.id])
+        self.assertEqual(list(found.values()), [loft])
+        found = storage.search_places(states=[state.id], cities=[dayton.id])
+        self.assertEqual(list(found.values()), [loft, barn])
+        found = storage.search_places(amenities=[wifi.id, pool.id])
+        self.assertEqual(list(found.values()), [barn])
+        found = storage.search_places(cities=[akron.id], amenities=[pool.id])
+        self.assertEqual(found, {})
+        storage.link_amenity(loft, pool)
+        found = storage.places_with_amenities([wifi.id, pool.id])
+        self.assertCountEqual(found.values(), [loft, barn])
+        storage.unlink_amenity(barn, pool)
+        found = storage.places_with_amenities([pool.id, "nope"], "any")
+        self.assertEqual(list(found.values()), [loft])
+        for obj in objs:
+            storage.delete(obj)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_get(self):
         """Test the get method"""
@@ -133,6 +340,382 @@ class TestFileStorage(unittest.TestCase):
         models.storage.save()
         new_count = models.storage.count(State)
         self.assertEqual(new_count, initial_count + 1)
+        self.assertEqual(models.storage.count("State"), new_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iterate(self):
+        """Test that iterate yields the objects matching the filters"""
+        storage = models.storage
+        state = State(name="Idaho")
+        cities = [City(name=name, state_id=state.id)
+                  for name in ("Boise", "Nampa", "Eagle")]
+        storage.new(state)
+        storage.save()
+        storage.bulk_save(cities)
+        found = storage.iterate(City, order_by="name", chunk_size=2,
+                                state_id=state.id)
+        self.assertNotIsInstance(found, (list, dict))
+        self.assertEqual([city.name for city in found],
+                         ["Boise", "Eagle", "Nampa"])
+        found = storage.iterate("State", id=state.id)
+        self.assertEqual([obj.id for obj in found], [state.id])
+        places = storage.search_places(cities=[cities[0].id], chunk_size=2)
+        self.assertEqual(list(places), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_events(self):
+        """Test that saved creations, updates and deletions are emitted"""
+        storage = models.storage
+        received = []
+        batches = []
+        storage.events.subscribe(received.append, State)
+        storage.events.subscribe(batches.append, mode="batch")
+        try:
+            state = State(name="Maine")
+            storage.new(state)
+            self.assertEqual(received, [])
+            storage.save()
+            state.name = "Vermont"
+            storage.save()
+            storage.delete(state)
+            storage.save()
+        finally:
+            storage.events.unsubscribe(received.append)
+            storage.events.unsubscribe(batches.append)
+        self.assertEqual([(event.type, event.key, event.obj)
+                          for event in received],
+                         [(type, "State." + state.id, state)
+                          for type in ("create", "update", "delete")])
+        self.assertEqual(len(batches), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version(self):
+        """Test that saving objects of a class bumps its version"""
+        storage = models.storage
+        state_version = storage.version(State)
+        version = storage.version()
+        state = State(name="Maine")
+        storage.new(state)
+        self.assertEqual(storage.version("State"), state_version)
+        storage.save()
+        self.assertGreater(storage.version(State), state_version)
+        self.assertGreater(storage.version(), version)
+        city_version = storage.version(City)
+        state.name = "Vermont"
+        storage.save()
+        self.assertEqual(storage.version(City), city_version)
+        self.assertGreater(storage.version(State, City),
+                           state_version + city_version)
+        state_version = storage.version(State)
+        storage.delete(state)
+        storage.save()
+        self.assertGreater(storage.version(State), state_version)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close(self):
+        """Test that close only reloads the file when it changed"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + state.id]["name"] = "Utah"
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        storage.close()
+        self.assertIsNot(storage.get(State, state.id), state)
+        self.assertEqual(storage.get(State, state.id).name, "Utah")
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_records(self):
+        """Test that reload rebuilds objects without calling __init__"""
+        storage = FileStorage()
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="Texas")
+        storage.bulk_new([user, state])
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["User." + user.id]["first_name"] = "Ada"
+        js["City.1"] = {"__class__": "City", "id": "1", "name": "Austin"}
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        with mock.patch.object(User, "__init__") as init:
+            storage.close()
+        self.assertFalse(init.called)
+        found = storage.get(User, user.id)
+        self.assertIsNot(found, user)
+        self.assertEqual(found.created_at, user.created_at)
+        self.assertIsInstance(found.updated_at, datetime)
+        self.assertFalse(found._dirty)
+        self.assertEqual(found.first_name, "Ada")
+        self.assertEqual(found.email, user.email)
+        city = storage.all(City, name="Austin")
+        self.assertEqual(len(city), 1)
+        for obj in [found, storage.get(State, state.id)] + \
+                list(city.values()):
+            storage.delete(obj)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy(self):
+        """Test that lazy reloads build objects on first use only"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        records = {}
+        for name in ["Ohio", "Utah"]:
+            record = dict(js["State." + state.id], name=name)
+            record["id"] = name.lower() + "-" + state.id
+            records["State." + record["id"]] = record
+        city = dict(js["State." + state.id], __class__="City",
+                    id="austin-" + state.id, state_id=record["id"])
+        records["City." + city["id"]] = city
+        js.update(records)
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        FileStorage._FileStorage__lazy = True
+        try:
+            count = storage.count(State)
+            storage.close()
+            self.assertEqual(storage.count(State), count + 2)
+            raw = FileStorage._FileStorage__raw
+            self.assertIn("State.ohio-" + state.id, raw["State"])
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(set(records) - set(json.load(f)), set())
+            ohio = storage.get(State, "ohio-" + state.id)
+            self.assertEqual(ohio.name, "Ohio")
+            self.assertIs(storage.get(State, "ohio-" + state.id), ohio)
+            self.assertEqual(storage.all(State)["State." + record["id"]]
+                             .cities[0].id, city["id"])
+            self.assertEqual(raw, {})
+        finally:
+            FileStorage._FileStorage__lazy = False
+        for key in records:
+            storage.delete(storage.all()[key])
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_events(self):
+        """Test that records left raw are only emitted when they change"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        records = {}
+        for name in ["Wifi", "Pool"]:
+            record = dict(js["State." + state.id], __class__="Amenity",
+                          name=name, id=name.lower() + "-" + state.id)
+            records["Amenity." + record["id"]] = record
+        js.update(records)
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        script = "\n".join([
+            "from models.state import State",
+            "state = State(name='Ohio')",
+            "state.save()",
+            "print(state.id)"])
+        received = []
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.close()
+            self.assertIn("Amenity.wifi-" + state.id,
+                          FileStorage._FileStorage__raw["Amenity"])
+            storage.events.subscribe(received.append)
+            storage.save()
+            ohio_id = subprocess.check_output(
+                [sys.executable, "-c", script],
+                universal_newlines=True).strip()
+            storage.close()
+            self.assertEqual([(event.type, event.key) for event in received],
+                             [("create", "State." + ohio_id)])
+            del received[:]
+            storage.delete(Amenity(**records["Amenity.wifi-" + state.id]))
+            storage.save()
+            self.assertEqual([(event.type, event.key) for event in received],
+                             [("delete", "Amenity.wifi-" + state.id)])
+        finally:
+            storage.events.unsubscribe(received.append)
+            FileStorage._FileStorage__lazy = False
+        storage.delete(storage.all()["Amenity.pool-" + state.id])
+        storage.delete(storage.get(State, ohio_id))
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_first_load_events(self):
+        """Test that the records of the first load emit no event"""
+        storage = FileStorage()
+        states = [State(name="State {}".format(i)) for i in range(3)]
+        storage.bulk_save(states)
+        script = "\n".join([
+            "import models",
+            "print(models.storage.count('State'), models.storage.version())"])
+        for lazy in ("", "1"):
+            with self.subTest(lazy=lazy):
+                env = dict(os.environ, HBNB_FILE_LAZY=lazy)
+                count, version = subprocess.check_output(
+                    [sys.executable, "-c", script], env=env,
+                    universal_newlines=True).split()
+                self.assertGreaterEqual(int(count), 3)
+                self.assertEqual(version, "0")
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot(self):
+        """Test saving to and lazily reloading from a snapshot file"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        settings = {"format": "snapshot", "file_path": "file.hbnb",
+                    "lazy": True}
+        saved = {}
+        for attr, value in settings.items():
+            saved[attr] = getattr(FileStorage, "_FileStorage__" + attr)
+            setattr(FileStorage, "_FileStorage__" + attr, value)
+        try:
+            storage.save()
+            ohio = dict(state.to_dict(), id="ohio-" + state.id, name="Ohio")
+            snapshot = file_storage.Snapshot("file.hbnb")
+            self.assertEqual(snapshot.get("State." + state.id),
+                             state.to_dict())
+            file_storage.Snapshot.write("file.hbnb", dict(snapshot.items()),
+                                        {"State." + ohio["id"]: ohio})
+            snapshot.close()
+            count = storage.count()
+            storage.close()
+            self.assertEqual(storage.count(), count + 1)
+            self.assertEqual(storage.get(State, ohio["id"]).name, "Ohio")
+            storage.export_json("file.json.export")
+            with open("file.json.export", "r") as f:
+                exported = json.load(f)
+            self.assertEqual(exported["State." + ohio["id"]], ohio)
+            storage.delete(storage.get(State, ohio["id"]))
+            storage.save()
+            self.assertIsNone(storage.get(State, ohio["id"]))
+            storage.import_json("file.json.export")
+            self.assertEqual(storage.get(State, ohio["id"]).name, "Ohio")
+            storage.delete(storage.get(State, ohio["id"]))
+            storage.delete(state)
+            storage.save()
+        finally:
+            for attr, value in saved.items():
+                setattr(FileStorage, "_FileStorage__" + attr, value)
+            for path in ["file.hbnb", "file.json.export"]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merge(self):
+        """Test that save keeps the changes saved by another process"""
+        storage = FileStorage()
+        texas = State(name="Texas")
+        storage.new(texas)
+        storage.save()
+        script = "\n".join([
+            "import models",
+            "from models.state import State",
+            "state = State(name='Ohio')",
+            "state.save()",
+            "models.storage.delete(models.storage.get(State, '{}'))",
+            "models.storage.save()",
+            "print(state.id)"]).format(texas.id)
+        utah = State(name="Utah")
+        storage.new(utah)
+        ohio_id = subprocess.check_output([sys.executable, "-c", script],
+                                          universal_newlines=True).strip()
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertIn("State." + ohio_id, js)
+        self.assertIn("State." + utah.id, js)
+        self.assertNotIn("State." + texas.id, js)
+        self.assertIsNone(storage.get(State, texas.id))
+        self.assertEqual(storage.get(State, ohio_id).name, "Ohio")
+        storage.delete(storage.get(State, ohio_id))
+        storage.delete(utah)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that save appends to the journal and close replays it"""
+        storage = FileStorage()
+        FileStorage._FileStorage__journal_path = "file.json.journal"
+        try:
+            state = State(name="Maine")
+            storage.new(state)
+            storage.save()
+            with open("file.json.journal", "r") as f:
+                entry = json.loads(f.readlines()[-1])
+            self.assertEqual(entry["key"], "State." + state.id)
+            self.assertEqual(entry["record"], state.to_dict())
+            entry["record"]["name"] = "Vermont"
+            with open("file.json.journal", "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "Vermont")
+            storage.delete(storage.get(State, state.id))
+            storage.save()
+            with open("file.json.journal", "r") as f:
+                self.assertIsNone(json.loads(f.readlines()[-1])["record"])
+            storage.compact()
+            self.assertEqual(os.path.getsize("file.json.journal"), 0)
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + state.id, json.load(f))
+        finally:
+            FileStorage._FileStorage__journal_path = None
+            os.remove("file.json.journal")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all with a class only returns objects of that class"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        city = City(name="Columbus", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(states, storage.all("State"))
+        self.assertEqual(len(states), storage.count(State))
+        storage.delete(state)
+        self.assertNotIn("State." + state.id, storage.all(State))
+        storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_load(self):
+        """Test that load accepts the relationships of the class only"""
+        storage = FileStorage()
+        state = State(name="Ohio")
+        city = City(name="Akron", state_id=state.id)
+        storage.bulk_new([state, city])
+        found = storage.all(State, load="cities.places")
+        self.assertIn("State." + state.id, found)
+        self.assertEqual(found["State." + state.id].cities, [city])
+        self.assertIs(storage.get(State, state.id, load={"cities": "joined"}),
+                      state)
+        storage.all(load=["cities", "reviews"])
+        with self.assertRaises(ValueError):
+            storage.all(State, load="places")
+        with self.assertRaises(ValueError):
+            storage.get(State, state.id, load={"cities": "eager"})
+        storage.delete(state)
+        storage.delete(city)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Contains the TestLoadingDocs and TestLoadPaths classes
+"""
+
+from models.engine import loading
+import pep8
+import unittest
+load_paths = loading.load_paths
+
+
+class TestLoadingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the loading module"""
+    def test_pep8_conformance_loading(self):
+        """Test that models/engine/loading.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/loading.py',
+                                    'tests/test_models/test_engine/\
+test_loading.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_loading_module_docstring(self):
+        """Test for the loading.py module docstring"""
+        self.assertIsNot(loading.__doc__, None,
+                         "loading.py needs a docstring")
+        self.assertTrue(len(loading.__doc__) >= 1,
+                        "loading.py needs a docstring")
+
+    def test_load_paths_docstring(self):
+        """Test for the load_paths function docstring"""
+        self.assertIsNot(load_paths.__doc__, None,
+                         "load_paths needs a docstring")
+        self.assertTrue(len(load_paths.__doc__) >= 1,
+                        "load_paths needs a docstring")
+
+
+class TestLoadPaths(unittest.TestCase):
+    """Test the load_paths function"""
+    def test_load_paths(self):
+        """Test that every form of load gives paths and strategies"""
+        self.assertEqual(load_paths(None), {})
+        self.assertEqual(load_paths("cities"), {("cities",): "selectin"})
+        self.assertEqual(load_paths(["cities.places", "reviews"]),
+                         {("cities", "places"): "selectin",
+                          ("reviews",): "selectin"})
+        self.assertEqual(load_paths({"amenities": "joined"}),
+                         {("amenities",): "joined"})
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy raises a ValueError"""
+        with self.assertRaises(ValueError):
+            load_paths({"cities": "eager"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+import inspect
+from models.engine import snapshot
+import os
+import pep8
+import unittest
+Snapshot = snapshot.Snapshot
+SnapshotRecords = snapshot.SnapshotRecords
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = [func for func in
+                     inspect.getmembers(Snapshot, inspect.isfunction) +
+                     inspect.getmembers(SnapshotRecords, inspect.isfunction)
+                     if func[1].__module__ == snapshot.__name__]
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py',
+                                    'tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_snapshot_class_docstrings(self):
+        """Test for the Snapshot and SnapshotRecords class docstrings"""
+        for cls in [Snapshot, SnapshotRecords]:
+            self.assertIsNot(cls.__doc__, None,
+                             "{} class needs a docstring".format(cls))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{} class needs a docstring".format(cls))
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in the snapshot methods"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the Snapshot and SnapshotRecords classes"""
+    path = "test_snapshot.hbnb"
+
+    def setUp(self):
+        """Writes a snapshot of two classes"""
+        self.records = {"State.1": {"id": "1", "name": "Ohio"},
+                        "State.2": {"id": "2", "name": "Utah"},
+                        "City.1": {"id": "1", "name": "Akron"},
+                        "StateX.1": {"id": "1"}}
+        Snapshot.write(self.path, self.records)
+        self.snapshot = Snapshot(self.path)
+
+    def tearDown(self):
+        """Removes the snapshot"""
+        self.snapshot.close()
+        os.remove(self.path)
+
+    def test_get(self):
+        """Test that get decodes the record of a key"""
+        self.assertEqual(len(self.snapshot), 4)
+        for key, record in self.records.items():
+            self.assertEqual(self.snapshot.get(key), record)
+        self.assertIsNone(self.snapshot.get("State.3"))
+        self.assertEqual(dict(self.snapshot.items()), self.records)
+
+    def test_classes(self):
+        """Test that classes returns the index range of each class"""
+        self.assertEqual(self.snapshot.classes(),
+                         {"City": (0, 1), "State": (1, 3),
+                          "StateX": (3, 4)})
+
+    def test_records(self):
+        """Test that the records of a class can be changed aside"""
+        records = self.snapshot.records("State")
+        self.assertEqual(len(records), 2)
+        self.assertIn("State.1", records)
+        self.assertNotIn("City.1", records)
+        self.assertEqual(records["State.2"], self.records["State.2"])
+        records["State.3"] = {"id": "3"}
+        records["State.1"] = {"id": "1", "name": "Iowa"}
+        del records["State.2"]
+        self.assertEqual(dict(records), {"State.1": {"id": "1",
+                                                     "name": "Iowa"},
+                                         "State.3": {"id": "3"}})
+        with self.assertRaises(KeyError):
+            del records["State.2"]
+        Snapshot.write(self.path, records, {"City.2": {"id": "2"}})
+        written = Snapshot(self.path)
+        self.assertEqual(dict(written.items()),
+                         dict(records, **{"City.2": {"id": "2"}}))
+        written.close()
+
+    def test_not_snapshot(self):
+        """Test that other files are rejected"""
+        with open(self.path + ".json", "w") as f:
+            f.write("{}" * 10)
+        try:
+            with self.assertRaises(ValueError):
+                Snapshot(self.path + ".json")
+        finally:
+            os.remove(self.path + ".json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Contains the TestResponseCacheDocs and TestResponseCache classes
+"""
+
+from flask import Flask, abort, make_response
+import inspect
+import models
+from models import storage
+from models.amenity import Amenity
+from models.engine.cache import LRUCache
+from models.state import State
+import pep8
+import subprocess
+import sys
+import unittest
+from unittest import mock
+from web_flask import response_cache
+
+
+class TestResponseCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of response_cache.py"""
+    def test_pep8_conformance_response_cache(self):
+        """Test that web_flask/response_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_flask/response_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_response_cache(self):
+        """Test tests/test_web_flask/test_response_cache.py conforms."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_web_flask/\
+test_response_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_response_cache_module_docstring(self):
+        """Test for the response_cache.py module docstring"""
+        self.assertIsNot(response_cache.__doc__, None,
+                         "response_cache.py needs a docstring")
+        self.assertTrue(len(response_cache.__doc__) >= 1,
+                        "response_cache.py needs a docstring")
+
+    def test_response_cache_func_docstrings(self):
+        """Test for the presence of docstrings in response_cache functions"""
+        for name, func in inspect.getmembers(response_cache,
+                                             inspect.isfunction):
+            if func.__module__ == response_cache.__name__:
+                self.assertTrue(func.__doc__,
+                                "{:s} needs a docstring".format(name))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the cached decorator"""
+    def setUp(self):
+        """Builds an app whose view counts its calls, with an empty cache"""
+        self.calls = []
+        app = Flask(__name__)
+
+        @app.route("/states", methods=["GET", "POST"])
+        @response_cache.cached("State")
+        def states():
+            """returns the number of calls of the view, with an ETag"""
+            self.calls.append(1)
+            response = make_response(str(len(self.calls)))
+            response.add_etag()
+            return response
+
+        @app.route("/missing")
+        @response_cache.cached("State")
+        def missing():
+            """counts the call and aborts"""
+            self.calls.append(1)
+            abort(404)
+        self.client = app.test_client()
+        patcher = mock.patch.object(response_cache, "backend",
+                                    LRUCache(16, 60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit(self):
+        """Test that a response is rendered once per path"""
+        self.assertEqual(self.client.get("/states").data, b"1")
+        response = self.client.get("/states")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"1")
+        self.assertEqual(self.client.get("/states?page=2").data, b"2")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_conditional(self):
+        """Test that a cached response answers conditional requests"""
+        etag = self.client.get("/states").headers["ETag"]
+        self.assertEqual(self.client.get("/states").headers["ETag"], etag)
+        response = self.client.get("/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_invalidation(self):
+        """Test that saving an object of the classes renders it again"""
+        self.client.get("/states")
+        amenity = Amenity(name="Wifi")
+        amenity.save()
+        self.assertEqual(self.client.get("/states").data, b"1")
+        state = State(name="Utah")
+        state.save()
+        self.assertEqual(self.client.get("/states").data, b"2")
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(self.client.get("/states").data, b"3")
+        self.assertEqual(self.client.get("/states").data, b"3")
+        storage.delete(amenity)
+        storage.save()
+        storage.close()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_other_process(self):
+        """Test that a save of another process renders it again"""
+        self.assertEqual(self.client.get("/states").data, b"1")
+        script = "\n".join([
+            "from models.state import State",
+            "state = State(name='Ohio')",
+            "state.save()",
+            "print(state.id)"])
+        state_id = subprocess.check_output([sys.executable, "-c", script],
+                                           universal_newlines=True).strip()
+        self.assertEqual(self.client.get("/states").data, b"2")
+        storage.delete(storage.get(State, state_id))
+        storage.save()
+
+    def test_not_cached(self):
+        """Test that errors and other methods are not cached"""
+        self.client.get("/missing")
+        self.assertEqual(self.client.get("/missing").status_code, 404)
+        self.client.post("/states")
+        self.client.post("/states")
+        self.assertEqual(len(self.calls), 4)
+
+    def test_disabled(self):
+        """Test that views are called every time without a backend"""
+        with mock.patch.object(response_cache, "backend", None):
+            self.client.get("/states")
+            self.client.get("/states")
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
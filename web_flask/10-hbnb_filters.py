@@ -6,13 +6,15 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.response_cache import cached
 app = Flask(__name__)
 
 
 @app.route('/hbnb_filters', strict_slashes=False)
+@cached("State", "City", "Amenity")
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
+    states = storage.all("State", load="cities").values()
     amenities = storage.all("Amenity").values()
     return render_template('10-hbnb_filters.html', states=states,
                            amenities=amenities)
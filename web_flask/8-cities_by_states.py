@@ -6,13 +6,15 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.response_cache import cached
 app = Flask(__name__)
 
 
 @app.route('/cities_by_states', strict_slashes=False)
+@cached("State", "City")
 def cities_by_states():
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State").values()
+    states = storage.all("State", load="cities").values()
     return render_template('8-cities_by_states.html', states=states)
 
 
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Cache of the GET responses of the Flask apps, see cached(). In DB mode
+storage.version() only counts the events of this process: the writes of
+other workers stay cached until HBNB_RESPONSE_CACHE_TTL expires.
+"""
+from flask import current_app, make_response, request
+from functools import wraps
+import models
+from models import storage
+from models.engine.cache import LRUCache
+import os
+
+# LRUCache of HBNB_RESPONSE_CACHE_SIZE responses (0 disables the cache)
+# kept HBNB_RESPONSE_CACHE_TTL seconds, or any object with its get(key)
+# and set(key, value) methods
+size = int(os.getenv("HBNB_RESPONSE_CACHE_SIZE", 256))
+backend = LRUCache(size, float(os.getenv("HBNB_RESPONSE_CACHE_TTL", 60))) \
+    if size > 0 else None
+
+
+def cached(*classes):
+    """decorates a view so that its GET responses are cached until an
+    object of classes (names or classes) is saved, in file mode by
+    another process too: the file is reloaded first if it changed"""
+    def decorator(view):
+        """returns the caching view of view"""
+        @wraps(view)
+        def cached_view(*args, **kwargs):
+            """returns the cached response, or the one of the view"""
+            if backend is None or request.method != "GET":
+                return view(*args, **kwargs)
+            if models.storage_t != "db":
+                storage.close()
+            key = (request.endpoint, request.full_path,
+                   storage.version(*classes))
+            entry = backend.get(key)
+            if entry is not None:
+                body, status, headers = entry
+                response = current_app.response_class(body, status, headers)
+                return response.make_conditional(request)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                backend.set(key, (response.get_data(), response.status_code,
+                                  list(response.headers.items())))
+            return response
+        return cached_view
+    return decorator